@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmarks - timing suite for the search stack
+
+Runs a fixed query corpus (queries.json, covering every domain and stack)
+against the search functions and writes JSON results that can be compared
+across commits:
+
+    bm25.fit/<domain>/x<scale>       fit a fresh index over 1x, 10x, 100x rows
+    bm25.score/<domain>/x<scale>     score one query against that index
+    search_csv/<domain>              ranked search of one domain (fitted index)
+    search_stack/<stack>             ranked search of one stack (fitted index)
+    search_stack/all                 merged ranking across every stack
+    search_all                       cross-domain search
+    warm_indexes/cold                load and fit every domain and stack index
+    generate_design_system/{cold,cached}
+    page_overrides/<pages>           page override search pass for a multi-page project
+
+Synthetic corpora repeat each CSV's rows with a per-copy marker term, so
+vocabulary and document lengths grow the way a larger data set would.
+
+Usage:
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --scales 1,10 --repeat 3 --only search_
+    python benchmarks/bench.py --output new.json --compare old.json
+
+Persisted caches (token memo, data bundle, design-system disk cache) are
+disabled so runs are comparable; pass --use-cache to measure with them.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+QUERY_FILE = BENCH_DIR / "queries.json"
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 5
+# Median change (as a fraction) reported as a regression/improvement by --compare
+COMPARE_THRESHOLD = 0.10
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_queries(path=QUERY_FILE):
+    """Load the query corpus and check it covers every domain and stack"""
+    from core import CSV_CONFIG, STACK_CONFIG
+
+    with open(path, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    missing = [d for d in CSV_CONFIG if not corpus["domains"].get(d)]
+    missing += [f"stack:{s}" for s in STACK_CONFIG if not corpus["stacks"].get(s)]
+    if missing:
+        raise ValueError(f"Query corpus has no queries for: {', '.join(missing)}")
+    return corpus
+
+
+def timed(fn, repeat, number=1):
+    """Time fn() in ms per call over repeat samples of number calls each"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0
+    }
+
+
+class Recorder:
+    """Collects timed() results by benchmark name, skipping names not selected by only."""
+
+    def __init__(self, only=None):
+        self.only = only
+        self.results = {}
+
+    def wanted(self, name):
+        return not self.only or any(term in name for term in self.only)
+
+    def time(self, name, fn, repeat, number=1, **extra):
+        if self.wanted(name):
+            self.results[name] = {**extra, **timed(fn, repeat, number)}
+
+
+def scale_documents(documents, factor):
+    """Repeat documents factor times; copy k gets a marker term in its first field"""
+    scaled = list(documents)
+    for copy in range(1, factor):
+        scaled += [[f"{fields[0]} synthetic{copy}"] + fields[1:] for fields in documents]
+    return scaled
+
+
+class _QueryCycle:
+    """Callable returning the next query of a list on each call."""
+
+    def __init__(self, queries, fn):
+        self.queries = queries
+        self.fn = fn
+        self.i = 0
+
+    def __call__(self):
+        query = self.queries[self.i % len(self.queries)]
+        self.i += 1
+        return self.fn(query)
+
+
+# ============ BENCHMARKS ============
+def bench_bm25(rec, corpus, scales, repeat):
+    """BM25.fit and BM25.score per domain over synthetic 1x..Nx corpora"""
+    from core import BM25, CSV_CONFIG, DATA_DIR, TOKENIZER_CONFIG, Tokenizer, _field_weight_list, _read_csv
+
+    for domain, config in CSV_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            continue
+        search_cols = config["search_cols"]
+        weights = _field_weight_list(search_cols, config.get("field_weights"))
+        documents = [[str(row.get(col, "")) for col in search_cols] for row in _read_csv(filepath)]
+        queries = corpus["domains"][domain]
+
+        for scale in scales:
+            fit_name, score_name = f"bm25.fit/{domain}/x{scale}", f"bm25.score/{domain}/x{scale}"
+            if not (rec.wanted(fit_name) or rec.wanted(score_name)):
+                continue
+            scaled = scale_documents(documents, scale)
+            # A fresh tokenizer per fit, so every sample pays for tokenization
+            fit = lambda: BM25(tokenizer=Tokenizer(**TOKENIZER_CONFIG)).fit(scaled, field_weights=weights)
+            rec.time(fit_name, fit, repeat if scale < 100 else max(1, repeat // 3), docs=len(scaled))
+
+            bm25 = BM25(tokenizer=Tokenizer(**TOKENIZER_CONFIG))
+            bm25.fit(scaled, field_weights=weights)
+            rec.time(score_name, _QueryCycle(queries, bm25.score), repeat, len(queries), docs=len(scaled))
+
+
+def bench_search(rec, corpus, repeat):
+    """_search_csv per domain, search_stack per stack and search_all on fitted indexes"""
+    from core import CSV_CONFIG, DATA_DIR, _search_csv, search_all, search_stack, warm_indexes
+
+    warm_indexes()
+    for domain, config in CSV_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            continue
+        queries = corpus["domains"][domain]
+        run = lambda q: _search_csv(filepath, config["search_cols"], config["output_cols"], q, 3,
+                                    config.get("field_weights"))
+        rec.time(f"search_csv/{domain}", _QueryCycle(queries, run), repeat, len(queries))
+
+    for stack, queries in corpus["stacks"].items():
+        rec.time(f"search_stack/{stack}", _QueryCycle(queries, lambda q: search_stack(q, stack)),
+                 repeat, len(queries))
+
+    if rec.wanted("search_stack/all"):
+        stack_queries = [q for queries in corpus["stacks"].values() for q in queries]
+        rec.time("search_stack/all", _QueryCycle(stack_queries, lambda q: search_stack(q, "all")),
+                 repeat, len(stack_queries))
+
+    if rec.wanted("search_all"):
+        all_queries = [q for queries in corpus["domains"].values() for q in queries]
+        search_all(all_queries[0])  # fit the unified index outside the timing
+        rec.time("search_all", _QueryCycle(all_queries, search_all), repeat, len(all_queries))
+
+
+def bench_cold_indexes(rec, repeat):
+    """Load and fit every domain and stack index from scratch"""
+    import core
+
+    def cold():
+        core._INDEX_CACHE.clear()
+        core.DEFAULT_TOKENIZER.memo.clear()
+        core.warm_indexes()
+
+    rec.time("warm_indexes/cold", cold, repeat)
+
+
+def bench_design_system(rec, corpus, repeat):
+    """generate_design_system end to end, uncached and from the result cache"""
+    from core import warm_indexes
+    from design_system import (DesignSystemGenerator, _generate_page_overrides, clear_generate_cache,
+                               generate_design_system)
+
+    warm_indexes()
+    queries = corpus["design_system"]
+    uncached = DesignSystemGenerator(use_cache=False, disk_cache=False)
+    rec.time("generate_design_system/cold", _QueryCycle(queries, uncached.generate), repeat, len(queries))
+
+    design_system = uncached.generate(queries[0])
+    pages = ["home", "dashboard", "pricing", "settings", "checkout"]
+    rec.time(f"page_overrides/{len(pages)}", lambda: _generate_page_overrides(pages, queries[0], design_system),
+             repeat, 10)
+
+    clear_generate_cache()
+    for query in queries:
+        generate_design_system(query)
+    rec.time("generate_design_system/cached", _QueryCycle(queries, generate_design_system), repeat, len(queries))
+
+
+def environment():
+    """Metadata identifying the machine, interpreter, commit and data of a run"""
+    from core import data_fingerprint
+
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=BENCH_DIR, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--", str(SCRIPTS_DIR))),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "data_fingerprint": data_fingerprint()[:12],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def run(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, only=None):
+    """Run the whole suite; returns {"environment", "options", "results"}"""
+    corpus = load_queries()
+    rec = Recorder(only)
+    bench_bm25(rec, corpus, scales, repeat)
+    bench_search(rec, corpus, repeat)
+    bench_cold_indexes(rec, repeat)
+    bench_design_system(rec, corpus, repeat)
+    return {
+        "environment": environment(),
+        "options": {"scales": list(scales), "repeat": repeat, "cache": bool(os.environ.get("UIPRO_BENCH_CACHE"))},
+        "results": rec.results
+    }
+
+
+# ============ REPORTING ============
+def format_results(report):
+    """Table of median/min timings"""
+    env = report["environment"]
+    lines = [f"## Benchmarks @ {env['commit'] or 'unknown'}{' (dirty)' if env['dirty'] else ''} "
+             f"- Python {env['python']}, {env['cpus']} CPUs",
+             f"{'benchmark':<44} {'median ms':>12} {'min ms':>12}"]
+    for name, result in report["results"].items():
+        lines.append(f"{name:<44} {result['median_ms']:>12.4f} {result['min_ms']:>12.4f}")
+    return "\n".join(lines)
+
+
+def format_comparison(baseline, report, threshold=COMPARE_THRESHOLD):
+    """Median timings of report against a baseline report, benchmark by benchmark"""
+    old_env, new_env = baseline["environment"], report["environment"]
+    lines = [f"## {old_env['commit'] or 'baseline'} -> {new_env['commit'] or 'current'}",
+             f"{'benchmark':<44} {'old ms':>10} {'new ms':>10} {'change':>9}"]
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            lines.append(f"{name:<44} {'-':>10} {result['median_ms']:>10.4f} {'new':>9}")
+            continue
+        change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] if old["median_ms"] else 0.0
+        flag = "  slower" if change > threshold else "  faster" if change < -threshold else ""
+        lines.append(f"{name:<44} {old['median_ms']:>10.4f} {result['median_ms']:>10.4f} {change:>+8.1%}{flag}")
+    if old_env.get("platform") != new_env.get("platform") or old_env.get("python") != new_env.get("python"):
+        lines.append("\nNote: baseline was recorded on a different platform or Python version")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max benchmark suite")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)), help="Synthetic corpus scales (default: 1,10,100)")
+    parser.add_argument("--repeat", "-r", type=int, default=DEFAULT_REPEAT, help="Samples per benchmark")
+    parser.add_argument("--only", action="append", default=None, help="Keep benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=str, default=None, metavar="BASELINE", help="Compare against an earlier JSON result")
+    parser.add_argument("--use-cache", action="store_true", help="Keep persisted caches (token memo, bundle) enabled")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    # Must be decided before core is imported; the query corpus covers the built-in domains only
+    os.environ["UIPRO_DOMAINS"] = ""
+    if args.use_cache:
+        os.environ["UIPRO_BENCH_CACHE"] = "1"
+    else:
+        os.environ["UIPRO_NO_CACHE"] = "1"
+
+    report = run([int(s) for s in args.scales.split(",") if s.strip()], max(1, args.repeat), args.only)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print(format_comparison(json.load(f), report))
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_results(report))
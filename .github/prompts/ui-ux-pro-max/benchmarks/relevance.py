@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Relevance Harness - golden rankings for search() and search_stack()
+
+golden.json records the expected top-k rows for every query in queries.json
+(each domain via search(), each stack via search_stack()). The harness reruns
+those queries and reports, per query and overall:
+
+    ndcg      nDCG@k of the current ranking, graded by golden position
+    overlap   |current top-k ∩ golden top-k| / k
+    exact     whether the top-k rows come back in the same order
+    ms        median search latency
+
+Rows are identified by a hash of their output columns, so any change to a
+returned row, its rank, or the set of rows shows up as a diff.
+
+Usage:
+    python benchmarks/relevance.py                      # compare against golden.json
+    python benchmarks/relevance.py --min-ndcg 0.95      # allow approximate engines
+    python benchmarks/relevance.py --update             # re-record golden rankings
+
+Exits with status 1 when mean nDCG or mean overlap fall below the thresholds
+(default 1.0: results must be equivalent).
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+BENCH_DIR = Path(__file__).resolve().parent
+GOLDEN_FILE = BENCH_DIR / "golden.json"
+DEFAULT_K = 5
+DEFAULT_REPEAT = 3
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+
+def row_id(row):
+    """Stable identity of a result row: hash of its output columns"""
+    raw = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def row_label(row):
+    """Short human-readable label for diffs (first output column)"""
+    return str(next(iter(row.values()), ""))[:60]
+
+
+def golden_queries(corpus):
+    """(kind, target, query) for every domain and stack query in the corpus"""
+    items = [("domain", domain, q) for domain, queries in corpus["domains"].items() for q in queries]
+    items += [("stack", stack, q) for stack, queries in corpus["stacks"].items() for q in queries]
+    return items
+
+
+def run_query(kind, target, query, k):
+    """Ranked result rows for one golden query"""
+    from core import search, search_stack
+
+    result = search(query, target, k) if kind == "domain" else search_stack(query, target, k)
+    return result.get("results", [])
+
+
+def record(corpus, k):
+    """Capture the current rankings as a golden dataset"""
+    from core import data_fingerprint
+
+    entries = []
+    for kind, target, query in golden_queries(corpus):
+        rows = run_query(kind, target, query, k)
+        entries.append({"kind": kind, "target": target, "query": query,
+                        "expected": [{"id": row_id(row), "label": row_label(row)} for row in rows]})
+    return {"k": k, "data_fingerprint": data_fingerprint()[:12], "queries": entries}
+
+
+# ============ METRICS ============
+def ndcg(expected, actual, k):
+    """nDCG@k; a golden row at position i has relevance k - i"""
+    relevance = {doc: k - i for i, doc in enumerate(expected[:k])}
+    dcg = sum(relevance.get(doc, 0) / math.log2(i + 2) for i, doc in enumerate(actual[:k]))
+    ideal = sum(rel / math.log2(i + 2) for i, rel in enumerate(sorted(relevance.values(), reverse=True)))
+    if not ideal:
+        return 1.0 if not actual else 0.0
+    return dcg / ideal
+
+
+def overlap(expected, actual, k):
+    """Share of the golden top-k present in the current top-k"""
+    expected, actual = expected[:k], actual[:k]
+    if not expected:
+        return 1.0 if not actual else 0.0
+    return len(set(expected) & set(actual)) / len(expected)
+
+
+def evaluate(golden, repeat=DEFAULT_REPEAT):
+    """Rerun every golden query; returns {"summary", "queries"} with per-query metrics"""
+    k = golden["k"]
+    rows = []
+    for entry in golden["queries"]:
+        samples = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            results = run_query(entry["kind"], entry["target"], entry["query"], k)
+            samples.append((time.perf_counter() - started) * 1000)
+
+        expected = [item["id"] for item in entry["expected"]]
+        actual = [row_id(row) for row in results]
+        labels = {item["id"]: item["label"] for item in entry["expected"]}
+        labels.update((row_id(row), row_label(row)) for row in results)
+        rows.append({
+            "kind": entry["kind"],
+            "target": entry["target"],
+            "query": entry["query"],
+            "ndcg": round(ndcg(expected, actual, k), 4),
+            "overlap": round(overlap(expected, actual, k), 4),
+            "exact": expected == actual,
+            "ms": round(statistics.median(samples), 4),
+            "missing": [labels[doc] for doc in expected if doc not in actual],
+            "unexpected": [labels[doc] for doc in actual if doc not in expected]
+        })
+
+    summary = {
+        "k": k,
+        "queries": len(rows),
+        "mean_ndcg": round(statistics.mean(r["ndcg"] for r in rows), 4) if rows else 1.0,
+        "mean_overlap": round(statistics.mean(r["overlap"] for r in rows), 4) if rows else 1.0,
+        "exact": sum(r["exact"] for r in rows),
+        "mean_ms": round(statistics.mean(r["ms"] for r in rows), 4) if rows else 0.0
+    }
+    return {"summary": summary, "queries": rows}
+
+
+def format_report(report, golden):
+    """Human-readable summary and a diff line for every query that changed"""
+    from core import data_fingerprint
+
+    summary = report["summary"]
+    lines = [
+        f"## Relevance vs golden (k={summary['k']}, {summary['queries']} queries)",
+        f"- mean nDCG@{summary['k']}: {summary['mean_ndcg']:.4f}",
+        f"- mean overlap:   {summary['mean_overlap']:.4f}",
+        f"- exact order:    {summary['exact']}/{summary['queries']}",
+        f"- mean latency:   {summary['mean_ms']:.4f} ms"
+    ]
+    if golden.get("data_fingerprint") != data_fingerprint()[:12]:
+        lines.append("- note: data CSVs changed since golden.json was recorded (--update to re-record)")
+
+    changed = [r for r in report["queries"] if not r["exact"]]
+    if changed:
+        lines += ["", "### Changed rankings"]
+    for r in changed:
+        lines.append(f"- [{r['kind']}:{r['target']}] \"{r['query']}\" ndcg={r['ndcg']:.4f} overlap={r['overlap']:.2f}")
+        if r["missing"]:
+            lines.append(f"    missing:    {'; '.join(r['missing'])}")
+        if r["unexpected"]:
+            lines.append(f"    unexpected: {'; '.join(r['unexpected'])}")
+        if not r["missing"] and not r["unexpected"]:
+            lines.append("    same rows, different order")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from bench import load_queries
+
+    parser = argparse.ArgumentParser(description="UI Pro Max relevance regression harness")
+    parser.add_argument("--golden", type=str, default=str(GOLDEN_FILE), help="Golden rankings file")
+    parser.add_argument("--update", action="store_true", help="Re-record golden rankings from the current engine")
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help="Ranking depth recorded with --update (default: 5)")
+    parser.add_argument("--repeat", "-r", type=int, default=DEFAULT_REPEAT, help="Timing samples per query")
+    parser.add_argument("--min-ndcg", type=float, default=1.0, help="Fail below this mean nDCG")
+    parser.add_argument("--min-overlap", type=float, default=1.0, help="Fail below this mean top-k overlap")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    # Golden rankings cover the built-in domains only
+    os.environ["UIPRO_DOMAINS"] = ""
+
+    if args.update:
+        golden = record(load_queries(), args.k)
+        with open(args.golden, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Recorded {len(golden['queries'])} golden rankings (k={args.k}) to {args.golden}")
+        sys.exit(0)
+
+    with open(args.golden, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    report = evaluate(golden, args.repeat)
+    print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_report(report, golden))
+
+    summary = report["summary"]
+    sys.exit(0 if summary["mean_ndcg"] >= args.min_ndcg and summary["mean_overlap"] >= args.min_overlap else 1)
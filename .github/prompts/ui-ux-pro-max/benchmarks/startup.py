@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Startup Benchmark - import-time budget for search.py
+
+Agents run search.py many times per session, so its startup cost is paid on
+every call. This benchmark runs fresh interpreters and checks that:
+  - importing search does not pull in modules only other modes need
+    (design_system, server, thread pools, difflib, ...)
+  - the median cumulative `python -X importtime` cost of search stays
+    within --budget-ms
+  - optionally, the median wall time of a full plain search stays within
+    --wall-budget-ms
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --budget-ms 40 --wall-budget-ms 150
+    python benchmarks/startup.py --json
+
+Exits with status 1 when any check fails.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 60.0
+DEFAULT_QUERY = "glassmorphism dark"
+
+# Modules a plain domain/stack search must not import
+LAZY_MODULES = ("design_system", "server", "concurrent.futures", "difflib", "http.client", "http.server")
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(module="search"):
+    """Import module in a fresh interpreter; returns {module: (self_us, cumulative_us)}"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return parse_importtime(proc.stderr)
+
+
+def measure_wall(args):
+    """Wall time in ms of one fresh `python <args>` run from the scripts directory"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=SCRIPTS_DIR, capture_output=True, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def run(runs=DEFAULT_RUNS, budget_ms=DEFAULT_BUDGET_MS, wall_budget_ms=None, query=DEFAULT_QUERY):
+    """Run every measurement and budget check; returns a JSON-serializable report"""
+    imports = [measure_import() for _ in range(runs)]
+    import_ms = [modules["search"][1] / 1000 for modules in imports]
+    core_ms = [modules["core"][1] / 1000 for modules in imports]
+    eager = sorted(name for name in LAZY_MODULES if name in imports[0])
+
+    interpreter_ms = [measure_wall(["-c", "pass"]) for _ in range(runs)]
+    search_ms = [measure_wall(["search.py", query]) for _ in range(runs)]
+
+    report = {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "import_search_ms": round(statistics.median(import_ms), 2),
+        "import_core_ms": round(statistics.median(core_ms), 2),
+        "interpreter_ms": round(statistics.median(interpreter_ms), 2),
+        "plain_search_ms": round(statistics.median(search_ms), 2),
+        "eager_modules": eager,
+        "budget_ms": budget_ms,
+        "wall_budget_ms": wall_budget_ms,
+        "failures": []
+    }
+    if eager:
+        report["failures"].append(f"search imports lazy-only modules: {', '.join(eager)}")
+    if report["import_search_ms"] > budget_ms:
+        report["failures"].append(f"import search took {report['import_search_ms']}ms (budget {budget_ms}ms)")
+    if wall_budget_ms is not None and report["plain_search_ms"] > wall_budget_ms:
+        report["failures"].append(f"plain search took {report['plain_search_ms']}ms (budget {wall_budget_ms}ms)")
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of a run() report"""
+    lines = [
+        f"## search.py startup (Python {report['python']}, median of {report['runs']} runs)",
+        f"- import search:      {report['import_search_ms']:8.2f} ms  (budget {report['budget_ms']} ms)",
+        f"- import core:        {report['import_core_ms']:8.2f} ms",
+        f"- bare interpreter:   {report['interpreter_ms']:8.2f} ms",
+        f"- plain search (e2e): {report['plain_search_ms']:8.2f} ms"
+        + (f"  (budget {report['wall_budget_ms']} ms)" if report["wall_budget_ms"] is not None else ""),
+    ]
+    if report["failures"]:
+        lines += ["", "FAILED:"] + [f"- {failure}" for failure in report["failures"]]
+    else:
+        lines += ["", "OK: within budget"]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search.py startup benchmark")
+    parser.add_argument("--runs", "-n", type=int, default=DEFAULT_RUNS, help="Fresh interpreters per measurement")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Max median import time of search")
+    parser.add_argument("--wall-budget-ms", type=float, default=None, help="Max median wall time of a plain search")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="Query used for the end-to-end run")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    report = run(args.runs, args.budget_ms, args.wall_budget_ms, args.query)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    sys.exit(1 if report["failures"] else 0)
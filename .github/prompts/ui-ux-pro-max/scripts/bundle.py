@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Bundle - Compiled binary form of the data CSVs
+
+The CSVs under data/ stay the source of truth. core.compile_bundle() (or
+`python search.py --build-bundle`) compiles them into one file that core.py
+memory-maps and reads lazily:
+
+    header     b"UIPB", format version (u32), directory length (u32)
+    directory  JSON: byte order, source hashes and section offsets
+    strings    every distinct cell value and term, UTF-8, stored once
+    tables     column-oriented: one u32 string id per row per column
+    indexes    BM25F postings per (file, search columns, weights, tokenizer),
+               plus the unified index spanning every domain and stack:
+               term string ids, per-term offsets, doc ids (u32), weights (f64)
+
+Tables and indexes record the content hash of their CSV (combined_hash() of
+all of them for an index over several tables); core only uses them while the
+hash still matches, so a stale bundle falls back to CSV parsing.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+MAGIC = b"UIPB"
+VERSION = 1
+_HEADER = struct.Struct("<4sII")
+_ALIGN = 8
+# String id stored for cells that csv.DictReader reports as None (short rows)
+_NONE = 0xFFFFFFFF
+
+
+def _aligned(size):
+    return size + (-size % _ALIGN)
+
+
+def combined_hash(hashes):
+    """Content hash of an index built over several tables, from their hashes in order"""
+    return hashlib.sha1("\n".join(hashes).encode("utf-8")).hexdigest()
+
+
+# ============ WRITER ============
+class _Sections:
+    """Append-only data area; add() returns the [offset, length] of a section."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def add(self, data):
+        data = data.tobytes() if isinstance(data, array) else data
+        padding = _aligned(self.size) - self.size
+        if padding:
+            self.chunks.append(b"\0" * padding)
+            self.size += padding
+        offset = self.size
+        self.chunks.append(data)
+        self.size += len(data)
+        return [offset, len(data)]
+
+
+class _StringTable:
+    """Interns strings to u32 ids in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def intern(self, text):
+        if text is None:
+            return _NONE
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.ids)
+        return sid
+
+    def encode(self, sections):
+        offsets = array("I", [0])
+        blobs = []
+        for text in self.ids:
+            blob = text.encode("utf-8")
+            blobs.append(blob)
+            offsets.append(offsets[-1] + len(blob))
+        return {"count": len(self.ids), "offsets": sections.add(offsets), "data": sections.add(b"".join(blobs))}
+
+
+def write_bundle(path, tables, indexes, fingerprint):
+    """
+    Write a bundle file.
+
+    Args:
+        path: Output file (written atomically)
+        tables: {name: (file_hash, rows)} with rows as lists of CSV row dicts
+        indexes: {key: (table name, fitted core.BM25)}; the name may be a
+            list of table names for an index whose documents are those
+            tables' rows concatenated in order
+        fingerprint: core.data_fingerprint() of the sources
+
+    Tables that cannot be stored losslessly (rows with extra, unnamed cells)
+    are skipped, along with their indexes; core reads those from CSV.
+
+    Returns:
+        {"tables": n, "indexes": n, "strings": n, "bytes": n}
+    """
+    strings = _StringTable()
+    sections = _Sections()
+    directory = {"byteorder": sys.byteorder, "fingerprint": fingerprint, "tables": {}, "indexes": {}}
+
+    for name, (file_hash, rows) in tables.items():
+        columns = list(dict.fromkeys(col for row in rows for col in row))
+        if None in columns:
+            continue
+        directory["tables"][name] = {
+            "hash": file_hash,
+            "rows": len(rows),
+            "columns": [[col, sections.add(array("I", (strings.intern(row.get(col)) for row in rows)))]
+                        for col in columns]
+        }
+
+    for key, (name, bm25) in indexes.items():
+        names = [name] if isinstance(name, str) else list(name)
+        tables = [directory["tables"].get(n) for n in names]
+        if None in tables:
+            continue
+        file_hash = tables[0]["hash"] if isinstance(name, str) else combined_hash(t["hash"] for t in tables)
+        terms = array("I")
+        offsets = array("I", [0])
+        docs = array("I")
+        weights = array("d")
+        for term in sorted(bm25.postings):
+            postings = bm25.postings[term]
+            terms.append(strings.intern(term))
+            docs.extend(postings.keys())
+            weights.extend(postings.values())
+            offsets.append(len(docs))
+        directory["indexes"][key] = {
+            "table": name,
+            "hash": file_hash,
+            "N": bm25.N,
+            "terms": sections.add(terms),
+            "offsets": sections.add(offsets),
+            "docs": sections.add(docs),
+            "weights": sections.add(weights)
+        }
+
+    directory["strings"] = strings.encode(sections)
+
+    header_dir = json.dumps(directory, separators=(",", ":")).encode("utf-8")
+    header = _HEADER.pack(MAGIC, VERSION, len(header_dir)) + header_dir
+    header += b"\0" * (_aligned(len(header)) - len(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for chunk in sections.chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+    return {"tables": len(directory["tables"]), "indexes": len(directory["indexes"]),
+            "strings": directory["strings"]["count"], "bytes": len(header) + sections.size}
+
+
+# ============ READER ============
+class Bundle:
+    """Memory-mapped bundle; strings, rows and postings are decoded on access."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Not a bundle: {self.path}")
+        magic, version, dir_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported bundle format: {self.path}")
+        self.directory = json.loads(self._mmap[_HEADER.size:_HEADER.size + dir_len])
+        if self.directory["byteorder"] != sys.byteorder:
+            raise ValueError(f"Bundle built for {self.directory['byteorder']}-endian: {self.path}")
+        self._view = memoryview(self._mmap)
+        self._base = _aligned(_HEADER.size + dir_len)
+
+        strings = self.directory["strings"]
+        self._string_offsets = self._array(strings["offsets"], "I")
+        self._string_base = self._base + strings["data"][0]
+        self._strings = {_NONE: None}
+
+    @property
+    def fingerprint(self):
+        return self.directory["fingerprint"]
+
+    def _array(self, section, typecode):
+        offset, length = section
+        start = self._base + offset
+        return self._view[start:start + length].cast(typecode)
+
+    def string(self, sid):
+        """Decode one interned string (cached)"""
+        text = self._strings.get(sid, False)
+        if text is False:
+            start = self._string_base + self._string_offsets[sid]
+            end = self._string_base + self._string_offsets[sid + 1]
+            text = self._strings[sid] = str(self._view[start:end], "utf-8")
+        return text
+
+    def table(self, name, file_hash):
+        """Rows of one CSV as a BundleTable, or None if absent or stale"""
+        table = self.directory["tables"].get(name)
+        if table is None or table["hash"] != file_hash:
+            return None
+        return BundleTable(self, [col for col, _ in table["columns"]],
+                           [self._array(section, "I") for _, section in table["columns"]], table["rows"])
+
+    def index(self, key, file_hash):
+        """(BundlePostings, document count) for one index key, or None if absent or stale"""
+        index = self.directory["indexes"].get(key)
+        if index is None or index["hash"] != file_hash:
+            return None
+        return BundlePostings(self, index), index["N"]
+
+
+class BundleTable:
+    """Read-only list of CSV row dicts backed by column arrays; rows are built on access."""
+
+    def __init__(self, bundle, names, columns, rows):
+        self.bundle = bundle
+        self.names = names
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.rows))]
+        string = self.bundle.string
+        return {name: string(column[idx]) for name, column in zip(self.names, self.columns)}
+
+    def __iter__(self):
+        for idx in range(self.rows):
+            yield self[idx]
+
+
+class BundlePostings:
+    """term -> {doc index: weight} mapping; each term's postings are decoded on first lookup."""
+
+    def __init__(self, bundle, index):
+        string = bundle.string
+        self._slots = {string(sid): slot for slot, sid in enumerate(bundle._array(index["terms"], "I"))}
+        self._offsets = bundle._array(index["offsets"], "I")
+        self._docs = bundle._array(index["docs"], "I")
+        self._weights = bundle._array(index["weights"], "d")
+        self._decoded = {}
+
+    def doc_freqs(self):
+        """Number of documents per term, without decoding any postings"""
+        offsets = self._offsets
+        return {term: offsets[slot + 1] - offsets[slot] for term, slot in self._slots.items()}
+
+    def get(self, term, default=None):
+        docs = self._decoded.get(term)
+        if docs is None:
+            slot = self._slots.get(term)
+            if slot is None:
+                return default
+            start, end = self._offsets[slot], self._offsets[slot + 1]
+            docs = self._decoded[term] = dict(zip(self._docs[start:end], self._weights[start:end]))
+        return docs
+
+    def __getitem__(self, term):
+        docs = self.get(term)
+        if docs is None:
+            raise KeyError(term)
+        return docs
+
+    def __contains__(self, term):
+        return term in self._slots
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
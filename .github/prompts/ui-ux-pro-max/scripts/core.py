@@ -5,64 +5,116 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import json
+import os
 import re
+import threading
+import warnings
+from bisect import bisect_left
 from pathlib import Path
 from math import log
 from collections import defaultdict
+from profiling import stage
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
 
+# Persisted index artifacts (bundle, ...); set UIPRO_NO_CACHE=1 to disable
+CACHE_DIR = Path(os.environ.get("UIPRO_CACHE_DIR") or Path(__file__).parent.parent / ".cache")
+CACHE_ENABLED = not os.environ.get("UIPRO_NO_CACHE")
+# Per-CSV token memo under CACHE_DIR/tokens; opt-in, it saves only a few ms per cold fit
+TOKEN_CACHE_ENV = "UIPRO_TOKEN_CACHE"
+
+# Compiled data bundle (see bundle.py); used when present and built from the current CSVs
+BUNDLE_PATH = Path(os.environ.get("UIPRO_BUNDLE") or CACHE_DIR / "data.bundle")
+
+# Extra user-supplied domains and stacks: manifest files and/or directories,
+# os.pathsep-separated (see load_user_domains()); set UIPRO_DOMAINS= to disable
+DOMAINS_PATH = os.environ.get("UIPRO_DOMAINS", str(Path(__file__).parent.parent / "domains"))
+
+# BM25 parameters (b is baked into fitted postings, so it is part of bundle index keys)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Fuzzy matching for query terms missing from an index's vocabulary: prefix
+# completion ("glassmorph") and one edit ("dashbord"), scored at a discount
+FUZZY_CONFIG = {"enabled": True, "prefix_min_length": 4, "edit_min_length": 5, "max_expansions": 3,
+                "prefix_weight": 0.9, "edit_weight": 0.7}
+
+# Synonym/alias groups (data/synonyms.csv), baked into postings at index build:
+# a row containing one member also matches the others at SYNONYM_WEIGHT of its tf
+SYNONYMS_FILE = "synonyms.csv"
+SYNONYM_WEIGHT = 0.8
+
+# Tokenizer pipeline: keep 2-letter terms like "ui", "ux", "3d", "ai"; stem/ngrams are opt-in
+TOKENIZER_CONFIG = {"min_length": 2, "stem": False, "ngrams": 1}
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "into", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "use", "via", "vs", "was", "with", "you", "your"
+])
+
+# field_weights: BM25F weight per search column (columns not listed weigh 1.0)
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
         "search_cols": ["Style Category", "Keywords", "Best For", "Type", "AI Prompt Keywords"],
+        "field_weights": {"Style Category": 3.0, "Keywords": 2.0, "Best For": 1.5, "Type": 1.0, "AI Prompt Keywords": 1.0},
         "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity", "AI Prompt Keywords", "CSS/Technical Keywords", "Implementation Checklist", "Design System Variables"]
     },
     "color": {
         "file": "colors.csv",
         "search_cols": ["Product Type", "Notes"],
+        "field_weights": {"Product Type": 3.0, "Notes": 1.0},
         "output_cols": ["Product Type", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Notes"]
     },
     "chart": {
         "file": "charts.csv",
         "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
+        "field_weights": {"Data Type": 3.0, "Keywords": 2.0, "Best Chart Type": 2.0, "Accessibility Notes": 0.5},
         "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
     },
     "landing": {
         "file": "landing.csv",
         "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
+        "field_weights": {"Pattern Name": 3.0, "Keywords": 2.0, "Conversion Optimization": 1.0, "Section Order": 0.5},
         "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
     },
     "product": {
         "file": "products.csv",
         "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
+        "field_weights": {"Product Type": 3.0, "Keywords": 2.0, "Primary Style Recommendation": 1.0, "Key Considerations": 0.5},
         "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
     },
     "ux": {
         "file": "ux-guidelines.csv",
         "search_cols": ["Category", "Issue", "Description", "Platform"],
+        "field_weights": {"Category": 2.0, "Issue": 3.0, "Description": 1.0, "Platform": 0.5},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "typography": {
         "file": "typography.csv",
         "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
+        "field_weights": {"Font Pairing Name": 2.0, "Category": 1.0, "Mood/Style Keywords": 2.5, "Best For": 1.5, "Heading Font": 1.0, "Body Font": 1.0},
         "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
     },
     "icons": {
         "file": "icons.csv",
         "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
+        "field_weights": {"Category": 1.5, "Icon Name": 3.0, "Keywords": 2.0, "Best For": 1.0},
         "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
     },
     "react": {
         "file": "react-performance.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 2.0, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "web": {
         "file": "web-interface.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 2.0, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     }
 }
@@ -86,133 +138,1125 @@ STACK_CONFIG = {
 # Common columns for all stacks
 _STACK_COLS = {
     "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
+    "field_weights": {"Category": 2.0, "Guideline": 3.0, "Description": 1.0, "Do": 1.0, "Don't": 0.5},
     "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
 }
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
+# Cross-domain search: relative weight per source (stacks use STACK_WEIGHT)
+DOMAIN_WEIGHTS = {
+    "style": 1.0,
+    "color": 0.9,
+    "chart": 1.0,
+    "landing": 1.0,
+    "product": 1.0,
+    "ux": 1.0,
+    "typography": 0.9,
+    "icons": 0.8,
+    "react": 0.9,
+    "web": 1.0
+}
+STACK_WEIGHT = 0.8
+
+# detect_domain(): weight of the per-domain centroid BM25 score added to keyword scores (0 = keywords only)
+DOMAIN_DETECT_BLEND = 0.0
+
+
+# ============ TOKENIZER ============
+_WORD_RE = re.compile(r'\w+')
+
+
+class Tokenizer:
+    """Precompiled tokenizer pipeline: lowercase, split, stopwords, min length,
+    optional light stemming and word n-grams.
+
+    cached() memoizes token lists for document text (rows are tokenized once
+    per process and can be persisted with dump()/load()); tokenize() is the
+    uncached path used for queries.
+    """
+
+    def __init__(self, min_length=2, stopwords=STOPWORDS, stem=False, ngrams=1):
+        self.min_length = min_length
+        self.stopwords = frozenset(stopwords or ())
+        self.stem = stem
+        self.ngrams = ngrams
+        self.memo = {}
+        config = f"{min_length}|{sorted(self.stopwords)}|{stem}|{ngrams}"
+        self.signature = hashlib.sha1(config.encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def _stem(word):
+        """Light suffix stripping (plurals, -ing, -ed)"""
+        if len(word) > 4 and word.endswith("ies"):
+            return word[:-3] + "y"
+        if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            return word[:-1]
+        if len(word) > 5 and word.endswith("ing"):
+            return word[:-3]
+        if len(word) > 4 and word.endswith("ed"):
+            return word[:-2]
+        return word
+
+    def tokenize(self, text):
+        """Tokenize text through the configured pipeline"""
+        words = [w for w in _WORD_RE.findall(str(text).lower())
+                 if len(w) >= self.min_length and w not in self.stopwords]
+        if self.stem:
+            words = [self._stem(w) for w in words]
+        if self.ngrams > 1:
+            words += ["_".join(words[i:i + n]) for n in range(2, self.ngrams + 1) for i in range(len(words) - n + 1)]
+        return words
+
+    def cached(self, text):
+        """Tokenize document text, memoizing the token list"""
+        tokens = self.memo.get(text)
+        if tokens is None:
+            tokens = self.memo[text] = self.tokenize(text)
+        return tokens
+
+    def load(self, path):
+        """Seed the memo from a persisted token file; returns the number of entries"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        self.memo.update(entries)
+        return len(entries)
+
+    def dump(self, path, texts):
+        """Persist memoized token lists for texts"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({text: self.cached(text) for text in texts}, f, ensure_ascii=False, separators=(",", ":"))
+        except OSError:
+            pass
+
+
+DEFAULT_TOKENIZER = Tokenizer(**TOKENIZER_CONFIG)
+
+
+# ============ KEYWORD MATCHING ============
+_KEYWORD_WORD_RE = re.compile(r"[a-z0-9]+(?:[.\-'][a-z0-9]+)*")
+
+
+class KeywordMatcher:
+    """Weighted multi-label keyword matcher compiled into hash lookups.
+
+    keywords_by_label maps a label to keywords, each a string (weight 1.0) or a
+    (keyword, weight) tuple. Text is split into words once; single words,
+    multi-word phrases and plural "s"/"es" forms are then resolved with dict
+    lookups, so matching is word-boundary aware and costs O(words) regardless
+    of the number of keywords. Keywords without letters or digits (e.g. "#")
+    fall back to substring checks. Each distinct keyword counts once per text.
+    Ties in best() go to the label listed first.
+    """
+
+    def __init__(self, keywords_by_label):
+        self.labels = list(keywords_by_label)
+        self.order = {label: i for i, label in enumerate(self.labels)}
+        self.targets = defaultdict(list)
+        self.symbols = []
+        for label, keywords in keywords_by_label.items():
+            for kw in keywords:
+                kw, weight = kw if isinstance(kw, tuple) else (kw, 1.0)
+                kw = kw.lower()
+                self.targets[kw].append((label, weight))
+                if not any(c.isalnum() for c in kw):
+                    self.symbols.append(kw)
+        self.targets = dict(self.targets)
+        # Multi-word phrases indexed by their first word
+        self.phrases = defaultdict(list)
+        for kw in self.targets:
+            if " " in kw:
+                self.phrases[kw.split()[0]].append((kw.split(), kw))
+        self.phrases = dict(self.phrases)
+
+    def _words(self, text):
+        """Words of text; compound words (e-commerce, next.js) also yield their parts"""
+        words = []
+        for word in _KEYWORD_WORD_RE.findall(text):
+            words.append(word)
+            if not word.isalnum():
+                words.extend(w for w in re.split(r"[.\-']", word) if w)
+        return words
+
+    def _lookup(self, word):
+        """Resolve a word (or its singular form) to a keyword"""
+        if word in self.targets:
+            return word
+        if word.endswith("es") and word[:-2] in self.targets:
+            return word[:-2]
+        if word.endswith("s") and word[:-1] in self.targets:
+            return word[:-1]
+        return None
+
+    def matches(self, text):
+        """Return the set of keywords found in text"""
+        text = text.lower()
+        found = {kw for kw in self.symbols if kw in text}
+        words = self._words(text)
+        for i, word in enumerate(words):
+            kw = self._lookup(word)
+            if kw:
+                found.add(kw)
+            for phrase, joined in self.phrases.get(word, ()):
+                tail = words[i + 1:i + len(phrase)]
+                if (len(tail) == len(phrase) - 1 and tail[:-1] == phrase[1:-1]
+                        and tail[-1] in (phrase[-1], phrase[-1] + "s", phrase[-1] + "es")):
+                    found.add(joined)
+        return found
+
+    def scores(self, text):
+        """Return {label: score} for every label with at least one match"""
+        scores = defaultdict(float)
+        for kw in self.matches(text):
+            for label, weight in self.targets[kw]:
+                scores[label] += weight
+        return dict(scores)
+
+    def best(self, text, default=None):
+        """Return the highest-scoring label (earliest label on ties), or default"""
+        scores = self.scores(text)
+        if not scores:
+            return default
+        return max(scores, key=lambda label: (scores[label], -self.order[label]))
+
+
+# Domain routing keywords for detect_domain(), compiled once. Generic terms weigh
+# less; multi-word and highly specific terms weigh more. Order breaks ties.
+DOMAIN_KEYWORDS = {
+    "color": ["color", "colour", "palette", ("hex", 1.5), "#", "rgb"],
+    "chart": [("chart", 1.5), "graph", "visualization", "trend", ("bar", 0.5), "pie", "scatter", "heatmap", "funnel"],
+    "landing": [("landing", 1.5), ("page", 0.5), "cta", "conversion", "hero", "testimonial", "pricing", ("section", 0.5)],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "style": [("style", 0.5), ("design", 0.5), ("ui", 0.5), "minimalism", "glassmorphism", "neumorphism", "brutalism",
+              ("dark mode", 1.5), "flat", "aurora", "prompt", ("css", 0.5), "implementation", ("variable", 0.5), "checklist", "tailwind"],
+    "ux": [("ux", 1.5), "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", ("mobile", 0.5)],
+    "typography": [("font", 1.5), ("typography", 1.5), "heading", "serif", "sans", ("sans-serif", 1.5)],
+    "icons": [("icon", 1.5), "lucide", "heroicons", "symbol", "glyph", "pictogram", ("svg icon", 2.0)],
+    "react": [("react", 1.5), "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle",
+              "waterfall", "barrel", ("dynamic import", 2.0), "rsc", ("server component", 2.0)],
+    "web": ["aria", ("focus", 0.5), "outline", "semantic", "virtualize", "autocomplete", ("form", 0.5), ("input type", 2.0), "preconnect"]
+}
+DOMAIN_MATCHER = KeywordMatcher(DOMAIN_KEYWORDS)
+
+
+# ============ USER DOMAINS ============
+def _csv_header(filepath):
+    """Column names of a CSV (its first row)"""
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _domain_manifests(paths, claimed):
+    """Yield (base dir, manifest dict, source) for every manifest file and CSV directory on paths
+
+    A directory's loose CSVs are listed after its manifests have been consumed,
+    skipping the resolved files in claimed (those the caller registered).
+    """
+    for entry in filter(None, paths.split(os.pathsep)):
+        path = Path(entry).expanduser()
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = sorted(path.glob("*.json"))
+        else:
+            continue
+        for file in files:
+            try:
+                with open(file, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                warnings.warn(f"Skipping domain manifest {file}: {e}")
+                continue
+            yield file.parent, manifest, str(file)
+        # Loose CSVs no manifest claims: <dir>/*.csv are domains, <dir>/stacks/*.csv stacks
+        if path.is_dir():
+            loose = {"domains": {}, "stacks": {}}
+            for kind, pattern in (("domains", "*.csv"), ("stacks", "stacks/*.csv")):
+                for file in sorted(path.glob(pattern)):
+                    if file.resolve() not in claimed:
+                        loose[kind][file.stem] = {"file": str(file.relative_to(path))}
+            if loose["domains"] or loose["stacks"]:
+                yield path, loose, str(path)
+
+
+def _domain_entry(base, spec, stack=False):
+    """Validated CSV_CONFIG/STACK_CONFIG entry for one user domain; raises ValueError"""
+    if not isinstance(spec, dict) or not spec.get("file"):
+        raise ValueError('needs a "file"')
+    filepath = (base / spec["file"]).resolve()
+    if not filepath.is_file():
+        raise ValueError(f"file not found: {filepath}")
+    header = _csv_header(filepath)
+    if stack:
+        columns = _STACK_COLS["search_cols"]
+        entry = {"file": str(filepath)}
+    else:
+        entry = {"file": str(filepath),
+                 "search_cols": list(spec.get("search_cols") or header),
+                 "output_cols": list(spec.get("output_cols") or header)}
+        if spec.get("field_weights"):
+            weights = {col: float(w) for col, w in spec["field_weights"].items()}
+            ignored = [col for col in weights if col not in entry["search_cols"]]
+            if ignored:
+                warnings.warn(f"Ignoring field_weights for {', '.join(ignored)} in {filepath.name}: "
+                              f"not in search_cols")
+            entry["field_weights"] = {col: w for col, w in weights.items() if col not in ignored}
+        columns = entry["search_cols"] + entry["output_cols"]
+    missing = [col for col in dict.fromkeys(columns) if col not in header]
+    if missing:
+        raise ValueError(f"{filepath.name} has no column(s) {', '.join(missing)}")
+    return entry
+
+
+def load_user_domains(paths=None):
+    """
+    Register user-supplied domains and stacks next to the built-in ones.
+
+    paths (default DOMAINS_PATH) lists manifest files and directories. A
+    manifest is JSON with files relative to it:
+
+        {"domains": {"brand": {"file": "brand.csv",
+                               "search_cols": ["Topic", "Rule"], "output_cols": ["Topic", "Rule", "Example"],
+                               "field_weights": {"Topic": 2.0},
+                               "keywords": ["brand", ["logo", 1.5]], "weight": 1.0}},
+         "stacks": {"remix": {"file": "remix.csv"}}}
+
+    search_cols/output_cols default to every column. keywords route
+    detect_domain() to the domain (default: its name) and weight scales it in
+    search_all(). Stacks need the built-in stack columns. A directory adds
+    every *.json manifest in it, plus each *.csv (domain) and stacks/*.csv
+    (stack) that no registered manifest entry uses. Invalid entries and names that clash
+    with existing ones are skipped with a warning.
+
+    Returns:
+        Names of the registered domains and stacks ("stack:<name>")
+    """
+    global DOMAIN_MATCHER
+    registered = []
+    claimed = set()
+    for base, manifest, source in _domain_manifests(DOMAINS_PATH if paths is None else paths, claimed):
+        for kind, config in (("domains", CSV_CONFIG), ("stacks", STACK_CONFIG)):
+            specs = manifest.get(kind) or {}
+            for name, spec in (specs.items() if isinstance(specs, dict) else ()):
+                if name in config or name == "all":
+                    warnings.warn(f"Skipping {kind[:-1]} {name!r} from {source}: name already in use")
+                    continue
+                try:
+                    entry = _domain_entry(base, spec, stack=kind == "stacks")
+                    if kind == "domains":
+                        weight = float(spec.get("weight", 1.0))
+                        keywords = [kw if isinstance(kw, str) else (str(kw[0]), float(kw[1]))
+                                    for kw in spec.get("keywords") or [name]]
+                except (ValueError, TypeError, IndexError, OSError) as e:
+                    warnings.warn(f"Skipping {kind[:-1]} {name!r} from {source}: {e}")
+                    continue
+                config[name] = entry
+                claimed.add(Path(entry["file"]))
+                if kind == "stacks":
+                    AVAILABLE_STACKS.append(name)
+                    registered.append(f"stack:{name}")
+                    continue
+                DOMAIN_WEIGHTS[name] = weight
+                DOMAIN_KEYWORDS[name] = keywords
+                registered.append(name)
+    if any(":" not in name for name in registered):
+        DOMAIN_MATCHER = KeywordMatcher(DOMAIN_KEYWORDS)
+    return registered
+
+
+load_user_domains()
+
+
+# ============ TERM DICTIONARY ============
+def _deletes(term):
+    """term with each single character removed"""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or transposition"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return (a[i + 1:] == b[i + 1:]
+            or (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]))
+
+
+class TermDictionary:
+    """Vocabulary of one index for prefix and one-edit lookups.
+
+    Prefix completion bisects the sorted terms (a flattened trie); edit lookup
+    uses a symmetric-delete index mapping each term's single-character deletes
+    back to the term, so a query only generates its own deletes.
+    """
+
+    def __init__(self, terms):
+        min_length = FUZZY_CONFIG["edit_min_length"]
+        self.terms = sorted(terms)
+        self.long_terms = {term for term in self.terms if len(term) >= min_length}
+        self.deletes = defaultdict(list)
+        for term in self.long_terms:
+            for variant in _deletes(term):
+                self.deletes[variant].append(term)
+
+    def prefix(self, token, limit):
+        """Up to limit terms starting with token, shortest first"""
+        matches = []
+        for i in range(bisect_left(self.terms, token), len(self.terms)):
+            if not self.terms[i].startswith(token):
+                break
+            matches.append(self.terms[i])
+        return sorted(matches, key=len)[:limit]
+
+    def near(self, token, limit):
+        """Up to limit terms within one edit of token"""
+        # token missing a character of term
+        candidates = set(self.deletes.get(token, ()))
+        for variant in _deletes(token):
+            # token with an extra character
+            if variant in self.long_terms:
+                candidates.add(variant)
+            # substitution or transposition: both sides share a delete
+            candidates.update(self.deletes.get(variant, ()))
+        return sorted(term for term in candidates if _within_one_edit(token, term))[:limit]
+
+    def expand(self, token):
+        """(term, weight) pairs standing in for a token that is not in the vocabulary"""
+        limit = FUZZY_CONFIG["max_expansions"]
+        expansions = []
+        if len(token) >= FUZZY_CONFIG["prefix_min_length"]:
+            expansions = [(term, FUZZY_CONFIG["prefix_weight"]) for term in self.prefix(token, limit)]
+        if not expansions and len(token) >= FUZZY_CONFIG["edit_min_length"]:
+            expansions = [(term, FUZZY_CONFIG["edit_weight"]) for term in self.near(token, limit)]
+        return expansions
+
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 / BM25F ranking algorithm for text search
+
+    Documents are either plain strings or lists of field strings. For
+    multi-field documents each field's term frequency is length-normalized
+    against that field's average length and weighted before saturation
+    (BM25F). All normalization is done in fit(), so score() only walks the
+    postings of the query terms. Query tokens missing from the vocabulary are
+    expanded through the index's TermDictionary (see FUZZY_CONFIG).
+
+    Each fit keeps per-document field stats keyed by the document's text, so
+    refitting after a few rows change (fit(previous=...)) only analyzes those.
+    """
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=BM25_K1, b=BM25_B, tokenizer=None):
         self.k1 = k1
         self.b = b
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
         self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
         self.N = 0
+        self.fuzzy = FUZZY_CONFIG["enabled"]
+        self._term_dictionary = None
+        # Per-document field stats kept for incremental refits (see fit(previous=...))
+        self.synonyms = {}
+        self.doc_keys = []
+        self.field_stats = []
+        self.reused = 0
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Tokenize query text with the index's tokenizer"""
+        return self.tokenizer.tokenize(text)
+
+    def fit(self, documents, groups=None, field_weights=None, synonyms=None, previous=None):
+        """Build BM25 index from documents.
+
+        groups optionally assigns each document to a group (e.g. its source CSV);
+        length normalization then uses the group's average field lengths, so
+        short and long corpora can share one index and one IDF table.
+
+        field_weights is a list with one weight per field, or a dict mapping
+        group -> list of weights when fields differ between groups.
 
-    def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
+        synonyms maps a term to its aliases (see load_synonyms()); aliases a
+        field lacks are indexed at SYNONYM_WEIGHT of the term's frequency,
+        without changing the field's length, so queries need no expansion.
+
+        previous is an earlier fit over an older version of the documents: its
+        per-document field stats are reused for documents whose text did not
+        change, so only new or edited documents are tokenized and counted.
+        Postings, document frequencies and IDF are then rebuilt from the
+        stats, giving exactly the index a full fit would.
+        """
+        synonyms = synonyms or {}
+        reusable = {}
+        if (previous is not None and previous.synonyms == synonyms
+                and previous.tokenizer.signature == self.tokenizer.signature):
+            reusable = dict(zip(previous.doc_keys, previous.field_stats))
+
+        self.synonyms = synonyms
+        self.doc_keys = [tuple(doc) if isinstance(doc, (list, tuple)) else (doc,) for doc in documents]
+        self.field_stats = []
+        self.reused = 0
+        with stage("index.tokenize"):
+            for key in self.doc_keys:
+                stats = reusable.get(key)
+                if stats is None:
+                    stats = self._analyze(key)
+                else:
+                    self.reused += 1
+                self.field_stats.append(stats)
+
+        self.corpus = [[word for tokens, _ in doc for word in tokens] for doc in self.field_stats]
         self.N = len(self.corpus)
         if self.N == 0:
             return
         self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Average length per (group, field) for per-field length normalization
+        if groups is None:
+            groups = [None] * self.N
+        totals = defaultdict(lambda: [0, 0])
+        for group, doc in zip(groups, self.field_stats):
+            for f, (tokens, _) in enumerate(doc):
+                totals[(group, f)][0] += len(tokens)
+                totals[(group, f)][1] += 1
+        avg_len = {key: (t[0] / t[1]) or 1 for key, t in totals.items()}
+
+        with stage("index.postings"):
+            postings = defaultdict(dict)
+            for idx, (group, doc) in enumerate(zip(groups, self.field_stats)):
+                weights = field_weights.get(group) if isinstance(field_weights, dict) else field_weights
+                for f, (tokens, term_freqs) in enumerate(doc):
+                    if not tokens:
+                        continue
+                    weight = weights[f] if weights else 1.0
+                    norm = 1 - self.b + self.b * len(tokens) / avg_len[(group, f)]
+                    for word, tf in term_freqs.items():
+                        doc_postings = postings[word]
+                        doc_postings[idx] = doc_postings.get(idx, 0) + weight * tf / norm
+
+            self.postings = dict(postings)
+            self.doc_freqs = defaultdict(int)
+            self.idf = {}
+            self._term_dictionary = None
+            self._set_doc_freqs({word: len(docs) for word, docs in postings.items()})
+
+    def _analyze(self, fields):
+        """Per-field (tokens, term frequencies) of one document, synonyms included"""
+        stats = []
+        for text in fields:
+            tokens = self.tokenizer.cached(text)
+            term_freqs = defaultdict(int)
+            for word in tokens:
+                term_freqs[word] += 1
+            if self.synonyms:
+                aliased = {}
+                for word, tf in term_freqs.items():
+                    for alias in self.synonyms.get(word, ()):
+                        if alias not in term_freqs:
+                            aliased[alias] = max(aliased.get(alias, 0), tf * SYNONYM_WEIGHT)
+                term_freqs.update(aliased)
+            stats.append((tokens, dict(term_freqs)))
+        return stats
+
+    def same_documents(self, documents, synonyms=None):
+        """Whether fit() over documents (same groups and weights) would rebuild exactly this index"""
+        keys = [tuple(doc) if isinstance(doc, (list, tuple)) else (doc,) for doc in documents]
+        return keys == self.doc_keys and (synonyms or {}) == self.synonyms
+
+    @classmethod
+    def from_postings(cls, postings, doc_freqs, n, tokenizer=None, k1=BM25_K1, b=BM25_B):
+        """Rebuild a fitted index from precomputed postings (e.g. a compiled bundle)"""
+        bm25 = cls(k1, b, tokenizer)
+        bm25.N = n
+        bm25.postings = postings
+        bm25._set_doc_freqs(doc_freqs)
+        return bm25
 
-        for word, freq in self.doc_freqs.items():
+    def _set_doc_freqs(self, doc_freqs):
+        for word, freq in doc_freqs.items():
+            self.doc_freqs[word] = freq
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
+    @property
+    def term_dictionary(self):
+        """TermDictionary over this index's vocabulary, built on the first fuzzy lookup"""
+        if self._term_dictionary is None:
+            self._term_dictionary = TermDictionary(self.postings)
+        return self._term_dictionary
+
+    def query_terms(self, query):
+        """(term, weight) pairs scored for query: known tokens at full weight,
+        unknown ones replaced by their prefix or one-edit expansions"""
+        terms = []
+        for token in self.tokenize(query):
+            if token in self.postings:
+                terms.append((token, 1.0))
+            elif self.fuzzy and self.N:
+                terms.extend(self.term_dictionary.expand(token))
+        return terms
+
+    def max_score(self, query):
+        """Upper bound of score() for query, used to normalize scores to [0, 1]"""
+        return sum(self.idf[term] * weight * (self.k1 + 1) for term, weight in self.query_terms(query))
+
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        scores = [0] * self.N
+        k1 = self.k1
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        for term, weight in self.query_terms(query):
+            idf = self.idf[term] * weight
+            for idx, tf in self.postings[term].items():
+                scores[idx] += idf * tf * (k1 + 1) / (k1 + tf)
+
+        return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+
+
+# ============ DATA FINGERPRINT ============
+_FILE_HASHES = {}
+
+
+def _file_hash(path):
+    """Content hash of one file, re-hashed only when its size or mtime changes"""
+    stat = path.stat()
+    key = (str(path), stat.st_mtime, stat.st_size)
+    file_hash = _FILE_HASHES.get(key)
+    if file_hash is None:
+        file_hash = _FILE_HASHES[key] = hashlib.sha1(path.read_bytes()).hexdigest()
+    return file_hash
+
+
+def data_fingerprint():
+    """Hash of every CSV under DATA_DIR; changes whenever any data file changes."""
+    digest = hashlib.sha1()
+    for path in sorted(DATA_DIR.rglob("*.csv")):
+        digest.update(f"{path.relative_to(DATA_DIR)}:{_file_hash(path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ============ SYNONYMS ============
+_SYNONYMS = {}
+
+
+def load_synonyms():
+    """term -> aliases map from data/synonyms.csv, reloaded when the file changes.
+
+    Each row is one group (Term plus comma-separated Aliases). Entries are run
+    through the tokenizer; entries that are not a single token are skipped.
+    """
+    path = DATA_DIR / SYNONYMS_FILE
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    if _SYNONYMS.get("mtime") != mtime:
+        aliases = defaultdict(set)
+        for row in _read_csv(path):
+            group = set()
+            for entry in [row.get("Term") or ""] + (row.get("Aliases") or "").split(","):
+                tokens = DEFAULT_TOKENIZER.tokenize(entry)
+                if len(tokens) == 1:
+                    group.add(tokens[0])
+            for term in group:
+                aliases[term] |= group - {term}
+        table = {term: tuple(sorted(others)) for term, others in aliases.items() if others}
+        signature = hashlib.sha1(json.dumps(sorted(table.items())).encode("utf-8")).hexdigest()[:12]
+        _SYNONYMS.update(mtime=mtime, table=table, signature=signature)
+    return _SYNONYMS["table"]
+
+
+def synonyms_signature():
+    """Short hash of the current synonym table ("" when there is none)"""
+    return _SYNONYMS.get("signature", "") if load_synonyms() else ""
+
+
+def mine_synonyms(min_support=2):
+    """
+    Propose synonym groups from the Keywords columns of every CSV.
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    Single-token keywords that appear on exactly the same rows (at least
+    min_support of them) are grouped. The output is a starting point for
+    curating data/synonyms.csv, not a table to apply blindly; groups whose
+    terms are already all in one synonyms.csv group are left out.
+    """
+    rows = defaultdict(set)
+    for path in sorted(DATA_DIR.rglob("*.csv")):
+        for idx, row in enumerate(_read_csv(path)):
+            for col, value in row.items():
+                if not col or not col.startswith("Keywords") or not value:
+                    continue
+                for keyword in value.split(","):
+                    tokens = DEFAULT_TOKENIZER.tokenize(keyword)
+                    if len(tokens) == 1:
+                        rows[tokens[0]].add((path.name, idx))
 
-            scores.append((idx, score))
+    groups = defaultdict(list)
+    for term, where in rows.items():
+        if len(where) >= min_support:
+            groups[frozenset(where)].append(term)
+    known = load_synonyms()
+    return [sorted(terms) for terms in groups.values()
+            if len(terms) > 1 and not all(set(terms) - {t} <= set(known.get(t, ())) for t in terms)]
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+# ============ COMPILED BUNDLE ============
+_BUNDLE = {}
+
+
+def get_bundle():
+    """Memory-map the compiled data bundle on first use; None if missing, unreadable or disabled"""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        stat = BUNDLE_PATH.stat()
+    except OSError:
+        return None
+    key = (stat.st_mtime, stat.st_size)
+    if _BUNDLE.get("key") != key:
+        from bundle import Bundle
+        try:
+            with stage("bundle.open"):
+                bundle = Bundle(BUNDLE_PATH)
+        except (OSError, ValueError, KeyError):
+            bundle = None
+        _BUNDLE.update(key=key, bundle=bundle)
+    return _BUNDLE["bundle"]
+
+
+def _bundle_name(filepath):
+    """Table name of a CSV inside the bundle (its path relative to DATA_DIR, else absolute)"""
+    try:
+        return Path(filepath).relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        return Path(filepath).resolve().as_posix()
+
+
+def _bundle_index_key(name, search_cols, weights, tokenizer):
+    """Bundle key of a fitted index; changes with anything that affects its postings"""
+    return json.dumps([name, list(search_cols), weights, tokenizer.signature, BM25_B, synonyms_signature()])
+
+
+def _bundled_index(filepath, search_cols, weights, tokenizer):
+    """(rows, BM25) straight from the bundle, or None when it has no fresh copy"""
+    bundle = get_bundle()
+    if bundle is None:
+        return None
+    name = _bundle_name(filepath)
+    file_hash = _file_hash(filepath)
+    index = bundle.index(_bundle_index_key(name, search_cols, weights, tokenizer), file_hash)
+    data = bundle.table(name, file_hash)
+    if index is None or data is None:
+        return None
+    postings, n = index
+    return data, BM25.from_postings(postings, postings.doc_freqs(), n, tokenizer)
+
+
+def _previous_bundle_parts(path, sources):
+    """
+    Fresh tables and indexes of an existing bundle file, copied into plain
+    lists and dicts so nothing keeps the old file mapped while it is replaced.
+
+    Args:
+        path: Bundle file about to be rewritten
+        sources: {table name: file hash} of the current CSVs
+
+    Returns:
+        ({name: rows}, {index key: BM25}); empty when there is no usable bundle
+    """
+    from bundle import Bundle, combined_hash
+
+    try:
+        bundle = Bundle(path)
+    except (OSError, ValueError, KeyError):
+        return {}, {}
+    tables = {}
+    for name, file_hash in sources.items():
+        rows = bundle.table(name, file_hash)
+        if rows is not None:
+            tables[name] = list(rows)
+    indexes = {}
+    for key, entry in bundle.directory["indexes"].items():
+        names = entry["table"]
+        if isinstance(names, str):
+            file_hash = sources.get(names)
+        else:
+            file_hash = combined_hash(sources[n] for n in names) if all(n in sources for n in names) else None
+        index = bundle.index(key, file_hash)
+        if index is not None:
+            postings, n = index
+            indexes[key] = BM25.from_postings({term: postings[term] for term in postings}, postings.doc_freqs(), n)
+    return tables, indexes
+
+
+def compile_bundle(path=None):
+    """
+    Compile every CSV (including user domains), every domain/stack index and
+    the unified search_all() index into a binary bundle.
+
+    The CSVs remain the source of truth: core uses a bundled table or index
+    only while its CSV's content hash matches, and otherwise parses the CSV.
+    Rebuilding is incremental: tables and indexes whose CSV is unchanged are
+    copied from the existing bundle, so only edited CSVs are parsed and refit.
+
+    Returns:
+        Summary dict from bundle.write_bundle() plus the output "path" and
+        the number of "refit" indexes
+    """
+    from bundle import write_bundle
+
+    path = Path(path) if path else BUNDLE_PATH
+    files = {_bundle_name(filepath): filepath for filepath in sorted(DATA_DIR.rglob("*.csv"))}
+    files.update((_bundle_name(filepath), filepath) for filepath, _, _ in _index_sources())
+    hashes = {name: _file_hash(filepath) for name, filepath in files.items()}
+    old_tables, old_indexes = _previous_bundle_parts(path, hashes)
+
+    tables = {}
+    for name, filepath in files.items():
+        rows = old_tables.get(name)
+        tables[name] = (hashes[name], rows if rows is not None else _read_csv(filepath))
+
+    indexes = {}
+    refit = 0
+    for filepath, search_cols, field_weights in _index_sources():
+        name = _bundle_name(filepath)
+        weights = _field_weight_list(search_cols, field_weights)
+        key = _bundle_index_key(name, search_cols, weights, DEFAULT_TOKENIZER)
+        bm25 = old_indexes.get(key)
+        if bm25 is None:
+            bm25 = _fit_rows(filepath, tables[name][1], search_cols, weights, DEFAULT_TOKENIZER)
+            refit += 1
+        indexes[key] = (name, bm25)
+
+    # The unified index behind search_all() / --domain all
+    sources = _unified_sources()
+    key = _unified_index_key(sources)
+    bm25 = old_indexes.get(key)
+    if bm25 is None:
+        _, bm25 = _fit_unified(sources, [tables[_bundle_name(DATA_DIR / source[1])][1] for source in sources])
+        refit += 1
+    indexes[key] = ([_bundle_name(DATA_DIR / source[1]) for source in sources], bm25)
+
+    summary = write_bundle(path, tables, indexes, data_fingerprint())
+    summary["path"] = str(path)
+    summary["refit"] = refit
+    return summary
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
+def _read_csv(filepath):
+    """Parse a CSV into a list of dicts"""
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+def _load_csv(filepath):
+    """Load CSV rows, from the compiled bundle when it has a fresh copy"""
+    bundle = get_bundle()
+    if bundle is not None:
+        data = bundle.table(_bundle_name(filepath), _file_hash(filepath))
+        if data is not None:
+            return data
+    return _read_csv(filepath)
+
+
+# Fitted indexes keyed by (file, search columns); refit when the CSV or synonym table changes
+_INDEX_CACHE = {}
+# One lock per index key so concurrent searches fit each index only once
+_INDEX_LOCKS = {}
+
+
+def _field_weight_list(search_cols, field_weights):
+    """Resolve a field_weights dict into one weight per search column"""
+    if not field_weights:
+        return None
+    return [field_weights.get(col, 1.0) for col in search_cols]
+
+
+def _token_cache_path(filepath, search_cols, tokenizer):
+    """Persisted token memo location for one CSV's search columns"""
+    source = hashlib.sha1(f"{filepath}|{search_cols}".encode("utf-8")).hexdigest()[:8]
+    return CACHE_DIR / "tokens" / f"{Path(filepath).stem}-{source}-{tokenizer.signature}.json"
+
+
+def _get_index(filepath, search_cols, field_weights=None):
+    """Load CSV and fit BM25 once, reusing the fitted index across queries"""
+    key = (str(filepath), tuple(search_cols), tuple(sorted((field_weights or {}).items())))
+    mtime = (filepath.stat().st_mtime, synonyms_signature())
+    cached = _INDEX_CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with _INDEX_LOCKS.setdefault(key, threading.Lock()):
+        cached = _INDEX_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        return _fit_index(key, mtime, filepath, search_cols, field_weights)
+
+
+def _fit_index(key, mtime, filepath, search_cols, field_weights):
+    """Load one CSV's BM25F index (bundled or fitted) and store it in _INDEX_CACHE
+
+    When the CSV changed since it was last fitted in this process, the stale
+    index is passed on so only new or edited rows are re-analyzed.
+    """
+    tokenizer = DEFAULT_TOKENIZER
+    weights = _field_weight_list(search_cols, field_weights)
+    stale = _INDEX_CACHE.get(key)
+    label = _bundle_name(filepath)
+    with stage("index.bundle", label):
+        bundled = _bundled_index(filepath, search_cols, weights, tokenizer)
+    if bundled is not None:
+        data, bm25 = bundled
+    else:
+        with stage("index.load_csv", label):
+            data = _load_csv(filepath)
+        previous = stale[2] if stale else None
+        with stage("index.refit" if previous is not None else "index.fit", label):
+            bm25 = _fit_rows(filepath, data, search_cols, weights, tokenizer, previous)
+    _INDEX_CACHE[key] = (mtime, data, bm25)
+    return data, bm25
 
-    data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+def _fit_rows(filepath, data, search_cols, weights, tokenizer, previous=None):
+    """Fit a BM25F index over rows of one CSV, reusing what it can of a previous fit"""
+    # One document per row with one field per search column
+    documents = [[str(row.get(col, "")) for col in search_cols] for row in data]
+    synonyms = load_synonyms()
+    # Edits outside the search columns leave the postings as they were
+    if previous is not None and previous.same_documents(documents, synonyms):
+        return previous
+
+    # With UIPRO_TOKEN_CACHE=1, reuse persisted token lists; rewrite them only when some row is new
+    persist_tokens = CACHE_ENABLED and bool(os.environ.get(TOKEN_CACHE_ENV))
+    if persist_tokens:
+        texts = {text for doc in documents for text in doc}
+        token_file = _token_cache_path(filepath, search_cols, tokenizer)
+        tokenizer.load(token_file)
+    stale = persist_tokens and any(text not in tokenizer.memo for text in texts)
+
+    bm25 = BM25(tokenizer=tokenizer)
+    bm25.fit(documents, field_weights=weights, synonyms=synonyms, previous=previous)
+    if stale:
+        tokenizer.dump(token_file, texts)
+    return bm25
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results, field_weights=None, label=None):
+    """Core search function using BM25F; returns (results, scores). label names the source in profiles"""
+    if not filepath.exists():
+        return [], []
 
     # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    data, bm25 = _get_index(filepath, search_cols, field_weights)
+    label = label or _bundle_name(filepath)
+    with stage("search.score", label):
+        ranked = bm25.score(query)
 
     # Get top results with score > 0
     results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
-
-
-def detect_domain(query):
-    """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
+    scores = []
+    with stage("search.rows", label):
+        for idx, score in ranked[:max_results]:
+            if score > 0:
+                row = data[idx]
+                results.append({col: row.get(col, "") for col in output_cols if col in row})
+                scores.append(round(score, 4))
+
+    return results, scores
+
+
+def _domain_centroid_scores(query):
+    """Score query against one centroid document per domain, normalized to [0, 1]"""
+    domains = [d for d, config in CSV_CONFIG.items() if (DATA_DIR / config["file"]).exists()]
+    key = tuple((d, (DATA_DIR / CSV_CONFIG[d]["file"]).stat().st_mtime) for d in domains)
+    if _CENTROID_INDEX.get("key") != key:
+        documents = []
+        for domain in domains:
+            config = CSV_CONFIG[domain]
+            data, _ = _get_index(DATA_DIR / config["file"], config["search_cols"], config.get("field_weights"))
+            documents.append([" ".join(str(row.get(col, "")) for row in data) for col in config["search_cols"]])
+        bm25 = BM25(tokenizer=Tokenizer(**TOKENIZER_CONFIG))
+        bm25.fit(documents, groups=domains)
+        _CENTROID_INDEX.update(key=key, domains=domains, index=bm25)
+
+    bm25 = _CENTROID_INDEX["index"]
+    ceiling = bm25.max_score(query) or 1
+    return {_CENTROID_INDEX["domains"][idx]: score / ceiling for idx, score in bm25.score(query) if score > 0}
+
+
+_CENTROID_INDEX = {}
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
+
+def detect_domain(query, blend=DOMAIN_DETECT_BLEND):
+    """Auto-detect the most relevant domain from query.
+
+    Keyword scores come from the precompiled DOMAIN_MATCHER. With blend > 0,
+    each domain's centroid BM25 score (0..1) times blend is added, which helps
+    queries with no routing keyword. Ties go to the earlier domain in
+    DOMAIN_KEYWORDS; no match falls back to "style".
+    """
+    scores = DOMAIN_MATCHER.scores(query)
+    if blend:
+        for domain, score in _domain_centroid_scores(query).items():
+            scores[domain] = scores.get(domain, 0) + blend * score
+    if not scores:
+        return "style"
+    order = DOMAIN_MATCHER.order
+    return max(scores, key=lambda domain: (scores[domain], -order[domain]))
+
+
+def _unified_sources():
+    """List (name, file, search_cols, output_cols, weight, field_weights) for every domain and stack"""
+    sources = [(domain, config["file"], config["search_cols"], config["output_cols"],
+                DOMAIN_WEIGHTS.get(domain, 1.0), config.get("field_weights"))
+               for domain, config in CSV_CONFIG.items()]
+    sources += [(f"stack:{stack}", config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"],
+                 STACK_WEIGHT, _STACK_COLS["field_weights"])
+                for stack, config in STACK_CONFIG.items()]
+    return [source for source in sources if (DATA_DIR / source[1]).exists()]
+
+
+# Unified index over all sources, keyed by the mtimes of every source file
+_UNIFIED_INDEX = {}
+
+
+def _unified_index_key(sources, tokenizer=DEFAULT_TOKENIZER):
+    """Bundle key of the unified index; changes with anything that affects its postings"""
+    return json.dumps(["all", [[name, _bundle_name(DATA_DIR / file), list(search_cols),
+                                _field_weight_list(search_cols, field_weights)]
+                               for name, file, search_cols, _, _, field_weights in sources],
+                       tokenizer.signature, BM25_B, synonyms_signature()])
+
+
+def _bundled_unified_index(sources):
+    """Unified BM25 straight from the bundle, or None when it has no fresh copy"""
+    bundle = get_bundle()
+    if bundle is None:
+        return None
+    from bundle import combined_hash
+
+    file_hash = combined_hash(_file_hash(DATA_DIR / source[1]) for source in sources)
+    index = bundle.index(_unified_index_key(sources), file_hash)
+    if index is None:
+        return None
+    postings, n = index
+    return BM25.from_postings(postings, postings.doc_freqs(), n)
+
+
+def _fit_unified(sources, tables, previous=None):
+    """Fit the unified index over each source's rows; returns (entries, BM25)"""
+    entries = []
+    documents = []
+    groups = []
+    group_weights = {}
+    for source_idx, (source, data) in enumerate(zip(sources, tables)):
+        _, _, search_cols, _, _, field_weights = source
+        group_weights[source_idx] = _field_weight_list(search_cols, field_weights)
+        for row in data:
+            entries.append((source_idx, row))
+            documents.append([str(row.get(col, "")) for col in search_cols])
+            groups.append(source_idx)
+
+    with stage("index.fit_unified", "all"):
+        bm25 = BM25()
+        bm25.fit(documents, groups, group_weights, synonyms=load_synonyms(), previous=previous)
+    return entries, bm25
+
+
+def _get_unified_index():
+    """
+    One BM25 index spanning every domain and stack CSV.
+
+    Rows come from _load_csv() and the postings from the bundle when it has a
+    fresh copy, so no per-source index is fitted along the way.
+    """
+    sources = _unified_sources()
+    key = tuple((source[1], (DATA_DIR / source[1]).stat().st_mtime) for source in sources)
+    key += (synonyms_signature(),)
+    if _UNIFIED_INDEX.get("key") == key:
+        return _UNIFIED_INDEX["index"]
+
+    with stage("index.load_csv", "all"):
+        tables = [_load_csv(DATA_DIR / source[1]) for source in sources]
+    with stage("index.bundle", "all"):
+        bm25 = _bundled_unified_index(sources)
+    if bm25 is not None:
+        entries = [(source_idx, row) for source_idx, data in enumerate(tables) for row in data]
+    else:
+        # Sources whose rows did not change keep their field stats from the last fit
+        previous = _UNIFIED_INDEX["index"][2] if _UNIFIED_INDEX else None
+        entries, bm25 = _fit_unified(sources, tables, previous)
+    index = (sources, entries, bm25)
+    _UNIFIED_INDEX.update(key=key, index=index)
+    return index
+
+
+def search_all(query, max_results=MAX_RESULTS, domains=None):
+    """
+    Cross-domain search over every CSV in one ranked result set.
+
+    Scores share one IDF table, are length-normalized within each source,
+    scaled to [0, 1] by the query's maximum attainable score and multiplied by
+    the source weight. domains optionally restricts the sources searched
+    (e.g. ["ux", "chart", "stack:react"]).
+    """
+    sources, entries, bm25 = _get_unified_index()
+    ceiling = bm25.max_score(query) or 1
+
+    with stage("search.score", "all"):
+        ranked = bm25.score(query)
+
+    scored = []
+    for idx, score in ranked:
+        if score <= 0:
+            break
+        name, _, _, _, weight, _ = sources[entries[idx][0]]
+        if domains and name not in domains:
+            continue
+        scored.append((score / ceiling * weight, idx))
+    scored.sort(key=lambda x: x[0], reverse=True)
+
+    results = []
+    scores = []
+    for score, idx in scored[:max_results]:
+        source_idx, row = entries[idx]
+        name, _, _, output_cols, _, _ = sources[source_idx]
+        results.append({"Domain": name, **{col: row.get(col, "") for col in output_cols if col in row}})
+        scores.append(round(score, 4))
+
+    return {
+        "domain": "all",
+        "query": query,
+        "file": "all",
+        "count": len(results),
+        "results": results,
+        "scores": scores
+    }
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
+    if domain == "all":
+        with stage("search", "all"):
+            return search_all(query, max_results)
     if domain is None:
-        domain = detect_domain(query)
+        with stage("detect_domain"):
+            domain = detect_domain(query)
 
     config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
     filepath = DATA_DIR / config["file"]
@@ -220,28 +1264,85 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    with stage("search", domain):
+        results, scores = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results,
+                                      config.get("field_weights"), domain)
 
     return {
         "domain": domain,
         "query": query,
         "file": config["file"],
         "count": len(results),
-        "results": results
+        "results": results,
+        "scores": scores
     }
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
-    """Search stack-specific guidelines"""
-    if stack not in STACK_CONFIG:
-        return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
+def _stack_names(stack):
+    """Stacks selected by a name, a comma-separated string, a list, or "all"; (names, unknown)"""
+    names = stack.split(",") if isinstance(stack, str) else list(stack or ())
+    names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+    if "all" in names:
+        return list(AVAILABLE_STACKS), []
+    return [name for name in names if name in STACK_CONFIG], [name for name in names if name not in STACK_CONFIG]
+
+
+def search_stack(query, stack, max_results=MAX_RESULTS, group=False):
+    """
+    Search stack-specific guidelines.
 
+    stack is one stack, several (a list or comma-separated string) or "all".
+    Several stacks are searched in one process against their cached indexes
+    and merged into one ranking: rows gain a "Stack" column and scores are
+    scaled to [0, 1] by each stack's maximum attainable score, as in
+    search_all(). With group=True they are returned per stack under "groups"
+    instead, each exactly as a single-stack search would rank them.
+    """
+    stacks, unknown = _stack_names(stack)
+    if unknown or not stacks:
+        return {"error": f"Unknown stack: {', '.join(unknown) or stack}. Available: {', '.join(AVAILABLE_STACKS)}, all"}
+    if len(stacks) == 1 and not group:
+        return _search_one_stack(query, stacks[0], max_results)
+
+    groups = {}
+    merged = []
+    for name in stacks:
+        filepath = DATA_DIR / STACK_CONFIG[name]["file"]
+        if not filepath.exists():
+            continue
+        if group:
+            groups[name] = _search_one_stack(query, name, max_results)
+            continue
+        data, bm25 = _get_index(filepath, _STACK_COLS["search_cols"], _STACK_COLS["field_weights"])
+        ceiling = bm25.max_score(query) or 1
+        with stage("search.score", f"stack:{name}"):
+            ranked = bm25.score(query)
+        merged += [(score / ceiling, name, data[idx]) for idx, score in ranked[:max_results] if score > 0]
+
+    result = {"domain": "stack", "stack": ",".join(stacks), "stacks": stacks, "query": query}
+    if group:
+        result.update(file="multiple", count=sum(g["count"] for g in groups.values()), groups=groups)
+        return result
+
+    merged.sort(key=lambda item: item[0], reverse=True)
+    output_cols = _STACK_COLS["output_cols"]
+    results = [{"Stack": name, **{col: row.get(col, "") for col in output_cols if col in row}}
+               for _, name, row in merged[:max_results]]
+    result.update(file="multiple", count=len(results), results=results,
+                  scores=[round(score, 4) for score, _, _ in merged[:max_results]])
+    return result
+
+
+def _search_one_stack(query, stack, max_results):
+    """search_stack() for a single, known stack"""
     filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
 
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    with stage("search", f"stack:{stack}"):
+        results, scores = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query,
+                                      max_results, _STACK_COLS["field_weights"], f"stack:{stack}")
 
     return {
         "domain": "stack",
@@ -249,5 +1350,83 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "query": query,
         "file": STACK_CONFIG[stack]["file"],
         "count": len(results),
-        "results": results
+        "results": results,
+        "scores": scores
     }
+
+
+def _index_sources():
+    """(filepath, search_cols, field_weights) of every existing domain and stack index"""
+    sources = [(DATA_DIR / config["file"], config["search_cols"], config.get("field_weights"))
+               for config in CSV_CONFIG.values()]
+    sources += [(DATA_DIR / config["file"], _STACK_COLS["search_cols"], _STACK_COLS["field_weights"])
+                for config in STACK_CONFIG.values()]
+    return [source for source in sources if source[0].exists()]
+
+
+def warm_indexes():
+    """Load and fit every domain and stack index up front; returns the number fitted"""
+    sources = _index_sources()
+    for filepath, search_cols, field_weights in sources:
+        _get_index(filepath, search_cols, field_weights)
+    return len(sources)
+
+
+def query_error(item):
+    """Why a query dict (batch line or daemon payload) cannot be run, or None when it is well-typed"""
+    if not isinstance(item, dict):
+        return "Query must be a JSON object or plain text"
+    query = item.get("query")
+    if not query:
+        return "Missing query"
+    if not isinstance(query, str):
+        return "query must be a string"
+    limit = item.get("max_results")
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+        return "max_results must be a positive integer"
+    domain = item.get("domain")
+    if domain is not None and not isinstance(domain, str):
+        return "domain must be a string"
+    if domain and domain != "all" and domain not in CSV_CONFIG:
+        return f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}, all"
+    stack = item.get("stack")
+    if stack is not None and not (isinstance(stack, str) or
+                                  isinstance(stack, list) and all(isinstance(s, str) for s in stack)):
+        return "stack must be a string or a list of strings"
+    return None
+
+
+class BatchParseError(dict):
+    """An input line that could not be parsed; search_batch() yields it as the line's error result."""
+
+
+def search_batch(queries, max_results=MAX_RESULTS):
+    """
+    Run many searches against shared, fitted indexes.
+
+    Each query is a dict with "query" and optional "domain", "stack" (one or
+    more, see search_stack()), "group", "max_results" and "id" keys. Yields
+    one result dict per query, in order; malformed queries yield an error,
+    and BatchParseError items (unparseable input lines) are passed through.
+    """
+    for item in queries:
+        if isinstance(item, BatchParseError):
+            yield dict(item)
+            continue
+
+        error = query_error(item)
+        if error:
+            result = {"error": error}
+        else:
+            query = item["query"]
+            limit = item.get("max_results") or max_results
+            domain = item.get("domain")
+            stack = item.get("stack")
+            if stack:
+                result = search_stack(query, stack, limit, bool(item.get("group", False)))
+            else:
+                result = search(query, domain, limit)
+
+        if isinstance(item, dict) and "id" in item:
+            result = {"id": item["id"], **result}
+        yield result
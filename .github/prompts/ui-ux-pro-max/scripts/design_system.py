@@ -11,19 +11,46 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Many projects in one run (shared indexes, generated in parallel)
+    results = generate_design_systems(load_manifest("projects.json"), persist=True)
+
+    # Stream output straight to a file handle or stdout
+    generate_design_system("SaaS dashboard", "My Project", out=sys.stdout)
 """
 
+import copy
 import csv
+import difflib
+import hashlib
+import io
 import json
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from profiling import stage
+from core import search, data_fingerprint, KeywordMatcher, CACHE_DIR, CACHE_ENABLED, DATA_DIR
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
 
+# generate() result cache: in-memory LRU, plus an on-disk store when UIPRO_DISK_CACHE=1
+GENERATE_CACHE_SIZE = 128
+DISK_CACHE_ENV = "UIPRO_DISK_CACHE"
+GENERATE_CACHE_VERSION = 2  # bump when the shape of generate() results changes
+
+# design system output formats; "compact" is single-line JSON for pipelines
+OUTPUT_FORMATS = ("ascii", "markdown", "json", "compact")
+
+# Searches run per page context when generating page overrides
+PAGE_SEARCH_CONFIG = {"style": 1, "ux": 3, "landing": 1}
+
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
     "style": {"max_results": 3},
@@ -33,57 +60,164 @@ SEARCH_CONFIG = {
 }
 
 
+# ============ REASONING RULES ============
+class ReasoningIndex:
+    """Precomputed lookup structures over ui-reasoning.csv.
+
+    Built once per process (see get_reasoning_index()) and shared by every
+    DesignSystemGenerator. Lowercased categories, keyword splits and parsed
+    Decision_Rules JSON are prepared up front, and resolved categories are
+    memoized so repeated lookups are a dict hit.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.exact = {}
+        self.entries = []
+        self.parsed_rules = {}
+        for rule in rules:
+            ui_cat = rule.get("UI_Category", "").lower()
+            self.exact.setdefault(ui_cat, rule)
+            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
+            self.entries.append((ui_cat, keywords, rule))
+            try:
+                self.parsed_rules[id(rule)] = json.loads(rule.get("Decision_Rules", "{}"))
+            except json.JSONDecodeError:
+                self.parsed_rules[id(rule)] = {}
+        self._resolved = {}
+
+    def find(self, category: str) -> dict:
+        """Find matching reasoning rule for a category (exact, partial, then keyword)."""
+        category_lower = category.lower()
+        if category_lower in self._resolved:
+            return self._resolved[category_lower]
+
+        rule = self.exact.get(category_lower)
+        if rule is None:
+            rule = next((r for ui_cat, _, r in self.entries
+                         if ui_cat in category_lower or category_lower in ui_cat), None)
+        if rule is None:
+            rule = next((r for _, keywords, r in self.entries
+                         if any(kw in category_lower for kw in keywords)), None)
+
+        self._resolved[category_lower] = rule or {}
+        return self._resolved[category_lower]
+
+    def decision_rules(self, rule: dict) -> dict:
+        """Return the pre-parsed Decision_Rules JSON for a rule."""
+        return dict(self.parsed_rules.get(id(rule), {}))
+
+
+_REASONING_INDEX = {}
+
+
+def get_reasoning_index() -> ReasoningIndex:
+    """Load ui-reasoning.csv once and return the shared ReasoningIndex."""
+    filepath = DATA_DIR / REASONING_FILE
+    mtime = filepath.stat().st_mtime if filepath.exists() else None
+    if _REASONING_INDEX.get("mtime") != mtime or "index" not in _REASONING_INDEX:
+        rules = []
+        if mtime is not None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                rules = list(csv.DictReader(f))
+        _REASONING_INDEX.update(mtime=mtime, index=ReasoningIndex(rules))
+    return _REASONING_INDEX["index"]
+
+
+# ============ RESULT CACHE ============
+_GENERATE_CACHE = OrderedDict()
+_GENERATE_CACHE_LOCK = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache keys: lowercase, single-spaced."""
+    return " ".join(query.lower().split())
+
+
+def _cache_key(query: str) -> str:
+    """Cache key from the normalized query and the hash of every data CSV."""
+    raw = f"{GENERATE_CACHE_VERSION}|{normalize_query(query)}|{data_fingerprint()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str, disk: bool):
+    with _GENERATE_CACHE_LOCK:
+        if key in _GENERATE_CACHE:
+            _GENERATE_CACHE.move_to_end(key)
+            return _GENERATE_CACHE[key]
+    if disk:
+        try:
+            with open(CACHE_DIR / "design-systems" / f"{key}.json", 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        _cache_put(key, result, disk=False)
+        return result
+    return None
+
+
+def _cache_put(key: str, result: dict, disk: bool):
+    with _GENERATE_CACHE_LOCK:
+        _GENERATE_CACHE[key] = result
+        _GENERATE_CACHE.move_to_end(key)
+        while len(_GENERATE_CACHE) > GENERATE_CACHE_SIZE:
+            _GENERATE_CACHE.popitem(last=False)
+    if disk:
+        path = CACHE_DIR / "design-systems" / f"{key}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+
+def clear_generate_cache():
+    """Drop all in-memory generate() results."""
+    with _GENERATE_CACHE_LOCK:
+        _GENERATE_CACHE.clear()
+
+
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
-    def __init__(self):
-        self.reasoning_data = self._load_reasoning()
-
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
-
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def __init__(self, use_cache: bool = True, disk_cache: bool = None):
+        self.reasoning_index = get_reasoning_index()
+        self.reasoning_data = self.reasoning_index.rules
+        self.use_cache = use_cache
+        if disk_cache is None:
+            disk_cache = bool(os.environ.get(DISK_CACHE_ENV))
+        self.disk_cache = disk_cache and CACHE_ENABLED
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, product_result: dict = None) -> dict:
+        """Execute searches across multiple domains.
+
+        Domains run one after another against the shared, cached indexes in core;
+        each search is well under a millisecond, less than a thread pool costs.
+        Pass product_result to reuse a product search that was already done.
+        """
+        queries = {}
         for domain, config in SEARCH_CONFIG.items():
+            if domain == "product" and product_result is not None:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                queries[domain] = f"{query} {priority_query}"
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
-
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
+                queries[domain] = query
 
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
+        results = {domain: _timed_search(q, domain, SEARCH_CONFIG[domain]["max_results"])
+                   for domain, q in queries.items()}
 
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+        if product_result is not None:
+            results["product"] = product_result
+        return {domain: results[domain] for domain in SEARCH_CONFIG}
 
-        return {}
+    def _find_reasoning_rule(self, category: str) -> dict:
+        """Find matching reasoning rule for a category."""
+        return self.reasoning_index.find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -101,13 +235,6 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
             "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
@@ -115,7 +242,7 @@ class DesignSystemGenerator:
             "typography_mood": rule.get("Typography_Mood", ""),
             "key_effects": rule.get("Key_Effects", ""),
             "anti_patterns": rule.get("Anti_Patterns", ""),
-            "decision_rules": decision_rules,
+            "decision_rules": self.reasoning_index.decision_rules(rule),
             "severity": rule.get("Severity", "MEDIUM")
         }
 
@@ -161,21 +288,50 @@ class DesignSystemGenerator:
         return search_result.get("results", [])
 
     def generate(self, query: str, project_name: str = None) -> dict:
-        """Generate complete design system recommendation."""
+        """Generate complete design system recommendation.
+
+        Results are memoized by normalized query; entries are invalidated
+        automatically when any CSV under data/ changes. The "_meta" key holds
+        per-domain queries, scores and timings; "_meta"["cached"] tells whether
+        those timings come from an earlier run.
+        """
+        if not self.use_cache:
+            result = self._generate(query, project_name)
+            result["_meta"]["cached"] = False
+            return result
+
+        with stage("generate.cache_lookup"):
+            key = _cache_key(query)
+            cached = _cache_get(key, self.disk_cache)
+        hit = cached is not None
+        if not hit:
+            cached = self._generate(query, None)
+            _cache_put(key, cached, self.disk_cache)
+
+        result = copy.deepcopy(cached)
+        result["project_name"] = project_name or query.upper()
+        result["_meta"]["cached"] = hit
+        return result
+
+    def _generate(self, query: str, project_name: str = None) -> dict:
+        """Run every search and reasoning step for one query."""
+        started = time.perf_counter()
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        with stage("generate.product"):
+            product_result = _timed_search(query, "product", 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
             category = product_results[0].get("Product Type", "General")
 
         # Step 2: Get reasoning rules for this category
-        reasoning = self._apply_reasoning(category, {})
+        with stage("generate.reasoning"):
+            reasoning = self._apply_reasoning(category, {})
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        with stage("generate.domains"):
+            search_results = self._multi_domain_search(query, style_priority, product_result)
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -232,15 +388,80 @@ class DesignSystemGenerator:
             "key_effects": combined_effects,
             "anti_patterns": reasoning.get("anti_patterns", ""),
             "decision_rules": reasoning.get("decision_rules", {}),
-            "severity": reasoning.get("severity", "MEDIUM")
+            "severity": reasoning.get("severity", "MEDIUM"),
+            "_meta": {
+                "query": query,
+                "domains": {
+                    domain: {
+                        "query": result.get("query", query),
+                        "count": result.get("count", 0),
+                        "scores": result.get("scores", []),
+                        "time_ms": result.get("time_ms", 0.0)
+                    }
+                    for domain, result in search_results.items()
+                },
+                "total_ms": round((time.perf_counter() - started) * 1000, 3)
+            }
         }
 
 
+def _timed_search(query: str, domain: str, max_results: int) -> dict:
+    """Run search() and record its wall time in milliseconds under "time_ms"."""
+    started = time.perf_counter()
+    result = search(query, domain, max_results)
+    result["time_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
 # ============ OUTPUT FORMATTERS ============
+# write_* functions stream a document to any text stream (file handle, stdout);
+# format_* functions are string-returning wrappers around them.
 BOX_WIDTH = 90  # Wider box for more content
 
-def format_ascii_box(design_system: dict) -> str:
-    """Format design system as ASCII box with emojis (MCP-style)."""
+
+class _LineWriter:
+    """Write lines to a stream, separated (not terminated) by newlines."""
+
+    def __init__(self, out):
+        self.out = out
+        self.first = True
+
+    def __call__(self, line: str = "") -> None:
+        if not self.first:
+            self.out.write("\n")
+        self.out.write(line)
+        self.first = False
+
+
+def _render(writer, *args, **kwargs) -> str:
+    """Run a write_* formatter into a string."""
+    buffer = io.StringIO()
+    writer(*args, out=buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def wrap_text(text: str, prefix: str, width: int):
+    """Yield prefixed lines of text wrapped to fit within width - 2 columns."""
+    if not text:
+        return
+    limit = width - 2
+    words = []
+    length = len(prefix)
+    for word in text.split():
+        if length + len(word) + 1 <= limit:
+            length += len(word) + (1 if words else 0)
+            words.append(word)
+        else:
+            if words:
+                yield prefix + " ".join(words)
+            words = [word]
+            length = len(prefix) + len(word)
+    if words:
+        yield prefix + " ".join(words)
+
+
+def write_ascii_box(design_system: dict, out) -> None:
+    """Write design system as ASCII box with emojis (MCP-style) to a text stream."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -249,103 +470,85 @@ def format_ascii_box(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
-
     # Build sections from pattern
     sections = pattern.get("sections", "").split(">")
     sections = [s.strip() for s in sections if s.strip()]
 
-    # Build output lines
-    lines = []
+    # Stream output lines
+    emit = _LineWriter(out)
     w = BOX_WIDTH - 1
 
-    lines.append("+" + "-" * w + "+")
-    lines.append(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
-    lines.append("+" + "-" * w + "+")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+    emit("+" + "-" * w + "+")
+    emit(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
+    emit("+" + "-" * w + "+")
+    emit("|" + " " * BOX_WIDTH + "|")
 
     # Pattern section
-    lines.append(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
     if pattern.get('conversion'):
-        lines.append(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
+        emit(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
     if pattern.get('cta_placement'):
-        lines.append(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append("|     Sections:".ljust(BOX_WIDTH) + "|")
+        emit(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
+    emit("|     Sections:".ljust(BOX_WIDTH) + "|")
     for i, section in enumerate(sections, 1):
-        lines.append(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        emit(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
+    emit("|" + " " * BOX_WIDTH + "|")
 
     # Style section
-    lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
     if style.get("keywords"):
         for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
     if style.get("best_for"):
         for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
     if style.get("performance") or style.get("accessibility"):
         perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        emit(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
+    emit("|" + " " * BOX_WIDTH + "|")
 
     # Colors section
-    lines.append("|  COLORS:".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
+    emit("|  COLORS:".ljust(BOX_WIDTH) + "|")
+    emit(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
     if colors.get("notes"):
         for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
+    emit("|" + " " * BOX_WIDTH + "|")
 
     # Typography section
-    lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
+    emit(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
     if typography.get("mood"):
         for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
     if typography.get("best_for"):
         for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
     if typography.get("google_fonts_url"):
-        lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
+        emit(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
     if typography.get("css_import"):
-        lines.append(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        emit(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
+    emit("|" + " " * BOX_WIDTH + "|")
 
     # Key Effects section
     if effects:
-        lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
+        emit("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
         for line in wrap_text(effects, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
+        emit("|" + " " * BOX_WIDTH + "|")
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
+        emit("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
         for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+            emit(line.ljust(BOX_WIDTH) + "|")
+        emit("|" + " " * BOX_WIDTH + "|")
 
     # Pre-Delivery Checklist section
-    lines.append("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
+    emit("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
     checklist_items = [
         "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
         "[ ] cursor-pointer on all clickable elements",
@@ -356,16 +559,19 @@ def format_ascii_box(design_system: dict) -> str:
         "[ ] Responsive: 375px, 768px, 1024px, 1440px"
     ]
     for item in checklist_items:
-        lines.append(f"|     {item}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        emit(f"|     {item}".ljust(BOX_WIDTH) + "|")
+    emit("|" + " " * BOX_WIDTH + "|")
 
-    lines.append("+" + "-" * w + "+")
+    emit("+" + "-" * w + "+")
 
-    return "\n".join(lines)
+
+def format_ascii_box(design_system: dict) -> str:
+    """Format design system as ASCII box with emojis (MCP-style)."""
+    return _render(write_ascii_box, design_system)
 
 
-def format_markdown(design_system: dict) -> str:
-    """Format design system as markdown."""
+def write_markdown(design_system: dict, out) -> None:
+    """Write design system as markdown to a text stream."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -374,133 +580,327 @@ def format_markdown(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
+    emit = _LineWriter(out)
+    emit(f"## Design System: {project}")
+    emit("")
 
     # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
+    emit("### Pattern")
+    emit(f"- **Name:** {pattern.get('name', '')}")
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
+        emit(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+        emit(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
     if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
+        emit(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
+    emit(f"- **Sections:** {pattern.get('sections', '')}")
+    emit("")
 
     # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
+    emit("### Style")
+    emit(f"- **Name:** {style.get('name', '')}")
     if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
+        emit(f"- **Keywords:** {style.get('keywords', '')}")
     if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
+        emit(f"- **Best For:** {style.get('best_for', '')}")
     if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
+        emit(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
+    emit("")
 
     # Colors section
-    lines.append("### Colors")
-    lines.append(f"| Role | Hex |")
-    lines.append(f"|------|-----|")
-    lines.append(f"| Primary | {colors.get('primary', '')} |")
-    lines.append(f"| Secondary | {colors.get('secondary', '')} |")
-    lines.append(f"| CTA | {colors.get('cta', '')} |")
-    lines.append(f"| Background | {colors.get('background', '')} |")
-    lines.append(f"| Text | {colors.get('text', '')} |")
+    emit("### Colors")
+    emit(f"| Role | Hex |")
+    emit(f"|------|-----|")
+    emit(f"| Primary | {colors.get('primary', '')} |")
+    emit(f"| Secondary | {colors.get('secondary', '')} |")
+    emit(f"| CTA | {colors.get('cta', '')} |")
+    emit(f"| Background | {colors.get('background', '')} |")
+    emit(f"| Text | {colors.get('text', '')} |")
     if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
+        emit(f"\n*Notes: {colors.get('notes', '')}*")
+    emit("")
 
     # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
+    emit("### Typography")
+    emit(f"- **Heading:** {typography.get('heading', '')}")
+    emit(f"- **Body:** {typography.get('body', '')}")
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        emit(f"- **Mood:** {typography.get('mood', '')}")
     if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
+        emit(f"- **Best For:** {typography.get('best_for', '')}")
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
+        emit(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
     if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
+        emit(f"- **CSS Import:**")
+        emit(f"```css")
+        emit(f"{typography.get('css_import', '')}")
+        emit(f"```")
+    emit("")
 
     # Key Effects section
     if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
+        emit("### Key Effects")
+        emit(f"{effects}")
+        emit("")
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
+        emit("### Avoid (Anti-patterns)")
         newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
+        emit(f"- {anti_patterns.replace(' + ', newline_bullet)}")
+        emit("")
 
     # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
+    emit("### Pre-Delivery Checklist")
+    emit("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
+    emit("- [ ] cursor-pointer on all clickable elements")
+    emit("- [ ] Hover states with smooth transitions (150-300ms)")
+    emit("- [ ] Light mode: text contrast 4.5:1 minimum")
+    emit("- [ ] Focus states visible for keyboard nav")
+    emit("- [ ] prefers-reduced-motion respected")
+    emit("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
+    emit("")
 
-    return "\n".join(lines)
+
+def format_markdown(design_system: dict) -> str:
+    """Format design system as markdown."""
+    return _render(write_markdown, design_system)
+
+
+def write_json(design_system: dict, out, compact: bool = False) -> None:
+    """Stream the raw design system dict, including "_meta", as JSON to out."""
+    if compact:
+        json.dump(design_system, out, ensure_ascii=False, separators=(",", ":"))
+    else:
+        json.dump(design_system, out, indent=2, ensure_ascii=False)
+
+
+def format_json(design_system: dict, compact: bool = False) -> str:
+    """Format design system as JSON (single line when compact)."""
+    return _render(write_json, design_system, compact=compact)
 
 
 # ============ MAIN ENTRY POINT ============
+def write_design_system(design_system: dict, output_format: str, out) -> None:
+    """Stream a design system in the given format (see OUTPUT_FORMATS) to out."""
+    with stage("render"):
+        if output_format == "markdown":
+            write_markdown(design_system, out)
+        elif output_format in ("json", "compact"):
+            write_json(design_system, out, compact=output_format == "compact")
+        else:
+            write_ascii_box(design_system, out)
+
+
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None, out=None) -> str:
     """
     Main entry point for design system generation.
 
     Args:
         query: Search query (e.g., "SaaS dashboard", "e-commerce luxury")
         project_name: Optional project name for output header
-        output_format: "ascii" (default) or "markdown"
+        output_format: "ascii" (default), "markdown", "json" or "compact"
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names; all overrides share one search pass
+        out: Optional text stream; if given, output is streamed to it and None is returned
 
     Returns:
-        Formatted design system string
+        Formatted design system string (None when streaming to out)
     """
     generator = DesignSystemGenerator()
     design_system = generator.generate(query, project_name)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, pages=pages)
+
+    if out is not None:
+        write_design_system(design_system, output_format, out)
+        return None
+    buffer = io.StringIO()
+    write_design_system(design_system, output_format, buffer)
+    return buffer.getvalue()
+
+
+def load_manifest(path: str) -> list:
+    """
+    Load a batch manifest: a JSON array or JSON Lines file of entries like
+    {"query": "SaaS dashboard", "project_name": "Acme", "pages": ["home", "dashboard"]}.
+    Plain strings are accepted as query-only entries.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        entries = json.loads(stripped)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    return [{"query": entry} if isinstance(entry, str) else entry for entry in entries]
+
+
+def pages_error(pages) -> str:
+    """Return why pages is not a list of page names, or None if it is (None means no pages)."""
+    if pages is None:
+        return None
+    if not isinstance(pages, list):
+        return "pages must be a list of page names"
+    for name in pages:
+        if not isinstance(name, str) or not name.strip():
+            return "pages must contain non-empty strings"
+        if "/" in name or "\\" in name:
+            return f"Invalid page name: {name}"
+    return None
+
+
+def page_names_error(page, pages) -> str:
+    """Return why a persist page/pages pair is invalid, or None if it is valid."""
+    if page is not None and not isinstance(page, str):
+        return "page must be a string"
+    return pages_error(pages) or (pages_error([page]) if page else None)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+
+def iter_design_systems(entries: list, persist: bool = False, output_dir: str = None,
+                        max_workers: int = 4, dry_run: bool = False):
+    """
+    Generate design systems for many projects, yielding results in manifest order.
+
+    All entries share the cached search indexes and reasoning rules and are
+    generated concurrently; persistence then runs in manifest order. Nothing is
+    rendered here, so callers can stream each result (see write_design_system())
+    without holding every document in memory.
+
+    Yields:
+        {"query", "project_name", "design_system", "persisted"} dicts
+        (or {"query", "project_name", "error"} for invalid entries)
+    """
+    generator = DesignSystemGenerator()
+
+    def run(entry) -> dict:
+        if not isinstance(entry, dict):
+            return {"query": None, "project_name": None, "error": "Invalid entry"}
+        query = entry.get("query", "")
+        if not query:
+            return {"query": query, "project_name": entry.get("project_name"), "error": "Missing query"}
+        if not isinstance(query, str):
+            return {"query": None, "project_name": entry.get("project_name"), "error": "Invalid query"}
+        project_name = entry.get("project_name")
+        if project_name is not None and not isinstance(project_name, str):
+            return {"query": query, "project_name": None, "error": "project_name must be a string"}
+        error = pages_error(entry.get("pages"))
+        if error:
+            return {"query": query, "project_name": project_name, "error": error}
+        return {"design_system": generator.generate(query, project_name)}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for entry, result in zip(entries, pool.map(run, entries)):
+            if "error" in result:
+                yield result
+                continue
+            design_system = result["design_system"]
+            # Persisted one entry at a time, in manifest order: entries that share a
+            # project slug never write the same directory concurrently; the last one wins
+            persisted = None
+            if persist:
+                persisted = persist_design_system(design_system, output_dir=output_dir, page_query=entry["query"],
+                                                  pages=entry.get("pages") or [], dry_run=dry_run)
+            yield {"query": entry["query"], "project_name": design_system["project_name"],
+                   "design_system": design_system, "persisted": persisted}
+
+
+def generate_design_systems(entries: list, output_format: str = "ascii", persist: bool = False,
+                            output_dir: str = None, max_workers: int = 4, dry_run: bool = False) -> list:
+    """
+    Batch entry point: generate design systems for many projects in one run.
+
+    Args:
+        entries: List of {"query", "project_name"?, "pages"?} dicts
+        output_format: "ascii" (default), "markdown", "json" or "compact"
+        persist: If True, write each project's MASTER.md and page overrides
+        output_dir: Optional output directory (defaults to current working directory)
+        max_workers: Number of projects generated in parallel
+        dry_run: With persist, report pending file changes without writing
+
+    Returns:
+        List of {"query", "project_name", "output", "persisted"} dicts
+    """
+    results = []
+    for result in iter_design_systems(entries, persist, output_dir, max_workers, dry_run):
+        if "design_system" in result:
+            buffer = io.StringIO()
+            write_design_system(result.pop("design_system"), output_format, buffer)
+            result["output"] = buffer.getvalue()
+        results.append(result)
+    return results
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+# "Generated:" timestamp lines are ignored when deciding whether a file changed
+_TIMESTAMP_LINE = re.compile(r'^(> )?\*\*Generated:\*\* .*$', re.MULTILINE)
+
+
+def _content_hash(content: str) -> str:
+    """Hash of file content with the generated timestamp masked out."""
+    return hashlib.sha1(_TIMESTAMP_LINE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _sync_file(path: Path, content: str, dry_run: bool, report: dict):
+    """Write content to path unless only the timestamp would change; record the outcome in report."""
+    old_content = None
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            old_content = f.read()
+
+    if old_content is not None and _content_hash(old_content) == _content_hash(content):
+        report["changes"][str(path)] = "unchanged"
+        report["unchanged_files"].append(str(path))
+        return
+
+    report["changes"][str(path)] = "new" if old_content is None else "modified"
+    if dry_run:
+        report["diffs"][str(path)] = "".join(difflib.unified_diff(
+            (old_content or "").splitlines(keepends=True),
+            content.splitlines(keepends=True),
+            fromfile=str(path) if old_content is not None else "/dev/null",
+            tofile=str(path)
+        ))
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    report["created_files"].append(str(path))
+
+
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None, dry_run: bool = False) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
+
+    Files whose content is unchanged (ignoring the "Generated:" timestamp) are
+    left untouched.
     
     Args:
         design_system: The generated design system dictionary
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of additional page names to write overrides for
+        dry_run: If True, write nothing and return unified diffs of pending changes
     
     Returns:
-        dict with created file paths and status
+        dict with status, written ("created_files") and unchanged file paths,
+        per-file changes ("new" / "modified" / "unchanged") and, for dry runs, diffs
+
+    Raises:
+        ValueError: page is not a string or pages is not a list of page names
     """
+    error = page_names_error(page, pages)
+    if error:
+        raise ValueError(error)
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
@@ -510,37 +910,54 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
     
-    created_files = []
+    report = {
+        "status": "dry-run" if dry_run else "success",
+        "design_system_dir": str(design_system_dir),
+        "created_files": [],
+        "unchanged_files": [],
+        "changes": {},
+        "diffs": {}
+    }
     
     # Create directories
-    design_system_dir.mkdir(parents=True, exist_ok=True)
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
+    if not dry_run:
+        design_system_dir.mkdir(parents=True, exist_ok=True)
+        pages_dir.mkdir(parents=True, exist_ok=True)
     
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
+    # Generate and sync MASTER.md
+    with stage("persist.master"):
+        _sync_file(design_system_dir / "MASTER.md", format_master_md(design_system), dry_run, report)
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+    # If pages are specified, create page override files with intelligent content;
+    # names sharing a file slug ("Home", "home") are written once, first name wins
+    page_files = {}
+    for page_name in ([page] if page else []) + (pages or []):
+        page_files.setdefault(page_name.lower().replace(' ', '-'), page_name)
+    if page_files:
+        with stage("persist.page_overrides"):
+            all_overrides = _generate_page_overrides(list(page_files.values()), page_query, design_system)
+        with stage("persist.pages"):
+            for slug, page_name in page_files.items():
+                content = format_page_override_md(design_system, page_name, page_query, all_overrides[page_name])
+                _sync_file(pages_dir / f"{slug}.md", content, dry_run, report)
     
-    return {
-        "status": "success",
-        "design_system_dir": str(design_system_dir),
-        "created_files": created_files
-    }
+    return report
+
+
+def format_persist_report(report: dict) -> str:
+    """Format a persist_design_system() result as a change summary (with diffs for dry runs)."""
+    lines = [f"{'Dry run' if report['status'] == 'dry-run' else 'Persisted'}: {report['design_system_dir']}"]
+    for path, change in report["changes"].items():
+        lines.append(f"  {change:<10} {path}")
+    for diff in report["diffs"].values():
+        if diff:
+            lines.append("")
+            lines.append(diff.rstrip("\n"))
+    return "\n".join(lines)
 
 
-def format_master_md(design_system: dict) -> str:
-    """Format design system as MASTER.md with hierarchical override logic."""
+def write_master_md(design_system: dict, out) -> None:
+    """Write design system as MASTER.md with hierarchical override logic to a text stream."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -551,364 +968,378 @@ def format_master_md(design_system: dict) -> str:
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    lines = []
+    emit = _LineWriter(out)
     
     # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit("# Design System Master File")
+    emit("")
+    emit("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
+    emit("> If that file exists, its rules **override** this Master file.")
+    emit("> If not, strictly follow the rules below.")
+    emit("")
+    emit("---")
+    emit("")
+    emit(f"**Project:** {project}")
+    emit(f"**Generated:** {timestamp}")
+    emit(f"**Category:** {design_system.get('category', 'General')}")
+    emit("")
+    emit("---")
+    emit("")
     
     # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
+    emit("## Global Rules")
+    emit("")
     
     # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
+    emit("### Color Palette")
+    emit("")
+    emit("| Role | Hex | CSS Variable |")
+    emit("|------|-----|--------------|")
+    emit(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
+    emit(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
+    emit(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
+    emit(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
+    emit(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
+    emit("")
     if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
+        emit(f"**Color Notes:** {colors.get('notes', '')}")
+        emit("")
     
     # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
+    emit("### Typography")
+    emit("")
+    emit(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
+    emit(f"- **Body Font:** {typography.get('body', 'Inter')}")
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        emit(f"- **Mood:** {typography.get('mood', '')}")
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
+        emit(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
+    emit("")
     if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
+        emit("**CSS Import:**")
+        emit("```css")
+        emit(typography.get("css_import", ""))
+        emit("```")
+        emit("")
     
     # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
+    emit("### Spacing Variables")
+    emit("")
+    emit("| Token | Value | Usage |")
+    emit("|-------|-------|-------|")
+    emit("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
+    emit("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
+    emit("| `--space-md` | `16px` / `1rem` | Standard padding |")
+    emit("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
+    emit("| `--space-xl` | `32px` / `2rem` | Large gaps |")
+    emit("| `--space-2xl` | `48px` / `3rem` | Section margins |")
+    emit("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
+    emit("")
     
     # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
+    emit("### Shadow Depths")
+    emit("")
+    emit("| Level | Value | Usage |")
+    emit("|-------|-------|-------|")
+    emit("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
+    emit("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
+    emit("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
+    emit("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
+    emit("")
     
     # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
+    emit("---")
+    emit("")
+    emit("## Component Specs")
+    emit("")
     
     # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    emit("### Buttons")
+    emit("")
+    emit("```css")
+    emit("/* Primary Button */")
+    emit(".btn-primary {")
+    emit(f"  background: {colors.get('cta', '#F97316')};")
+    emit("  color: white;")
+    emit("  padding: 12px 24px;")
+    emit("  border-radius: 8px;")
+    emit("  font-weight: 600;")
+    emit("  transition: all 200ms ease;")
+    emit("  cursor: pointer;")
+    emit("}")
+    emit("")
+    emit(".btn-primary:hover {")
+    emit("  opacity: 0.9;")
+    emit("  transform: translateY(-1px);")
+    emit("}")
+    emit("")
+    emit("/* Secondary Button */")
+    emit(".btn-secondary {")
+    emit(f"  background: transparent;")
+    emit(f"  color: {colors.get('primary', '#2563EB')};")
+    emit(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
+    emit("  padding: 12px 24px;")
+    emit("  border-radius: 8px;")
+    emit("  font-weight: 600;")
+    emit("  transition: all 200ms ease;")
+    emit("  cursor: pointer;")
+    emit("}")
+    emit("```")
+    emit("")
     
     # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    emit("### Cards")
+    emit("")
+    emit("```css")
+    emit(".card {")
+    emit(f"  background: {colors.get('background', '#FFFFFF')};")
+    emit("  border-radius: 12px;")
+    emit("  padding: 24px;")
+    emit("  box-shadow: var(--shadow-md);")
+    emit("  transition: all 200ms ease;")
+    emit("  cursor: pointer;")
+    emit("}")
+    emit("")
+    emit(".card:hover {")
+    emit("  box-shadow: var(--shadow-lg);")
+    emit("  transform: translateY(-2px);")
+    emit("}")
+    emit("```")
+    emit("")
     
     # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    emit("### Inputs")
+    emit("")
+    emit("```css")
+    emit(".input {")
+    emit("  padding: 12px 16px;")
+    emit("  border: 1px solid #E2E8F0;")
+    emit("  border-radius: 8px;")
+    emit("  font-size: 16px;")
+    emit("  transition: border-color 200ms ease;")
+    emit("}")
+    emit("")
+    emit(".input:focus {")
+    emit(f"  border-color: {colors.get('primary', '#2563EB')};")
+    emit("  outline: none;")
+    emit(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
+    emit("}")
+    emit("```")
+    emit("")
     
     # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    emit("### Modals")
+    emit("")
+    emit("```css")
+    emit(".modal-overlay {")
+    emit("  background: rgba(0, 0, 0, 0.5);")
+    emit("  backdrop-filter: blur(4px);")
+    emit("}")
+    emit("")
+    emit(".modal {")
+    emit("  background: white;")
+    emit("  border-radius: 16px;")
+    emit("  padding: 32px;")
+    emit("  box-shadow: var(--shadow-xl);")
+    emit("  max-width: 500px;")
+    emit("  width: 90%;")
+    emit("}")
+    emit("```")
+    emit("")
     
     # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
+    emit("---")
+    emit("")
+    emit("## Style Guidelines")
+    emit("")
+    emit(f"**Style:** {style.get('name', 'Minimalism')}")
+    emit("")
     if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
+        emit(f"**Keywords:** {style.get('keywords', '')}")
+        emit("")
     if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
+        emit(f"**Best For:** {style.get('best_for', '')}")
+        emit("")
     if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
+        emit(f"**Key Effects:** {effects}")
+        emit("")
     
     # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
+    emit("### Page Pattern")
+    emit("")
+    emit(f"**Pattern Name:** {pattern.get('name', '')}")
+    emit("")
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
+        emit(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
+        emit(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+    emit(f"- **Section Order:** {pattern.get('sections', '')}")
+    emit("")
     
     # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
+    emit("---")
+    emit("")
+    emit("## Anti-Patterns (Do NOT Use)")
+    emit("")
     if anti_patterns:
         anti_list = [a.strip() for a in anti_patterns.split("+")]
         for anti in anti_list:
             if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
+                emit(f"- ❌ {anti}")
+    emit("")
+    emit("### Additional Forbidden Patterns")
+    emit("")
+    emit("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
+    emit("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
+    emit("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
+    emit("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
+    emit("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
+    emit("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
+    emit("")
     
     # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+    emit("---")
+    emit("")
+    emit("## Pre-Delivery Checklist")
+    emit("")
+    emit("Before delivering any UI code, verify:")
+    emit("")
+    emit("- [ ] No emojis used as icons (use SVG instead)")
+    emit("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
+    emit("- [ ] `cursor-pointer` on all clickable elements")
+    emit("- [ ] Hover states with smooth transitions (150-300ms)")
+    emit("- [ ] Light mode: text contrast 4.5:1 minimum")
+    emit("- [ ] Focus states visible for keyboard navigation")
+    emit("- [ ] `prefers-reduced-motion` respected")
+    emit("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
+    emit("- [ ] No content hidden behind fixed navbars")
+    emit("- [ ] No horizontal scroll on mobile")
+    emit("")
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
-    """Format a page-specific override file with intelligent AI-generated content."""
+def format_master_md(design_system: dict) -> str:
+    """Format design system as MASTER.md with hierarchical override logic."""
+    return _render(write_master_md, design_system)
+
+
+def write_page_override_md(design_system: dict, page_name: str, out, page_query: str = None,
+                           page_overrides: dict = None) -> None:
+    """Write a page-specific override file with intelligent AI-generated content to a text stream.
+
+    page_overrides may be passed in when already computed in a batch
+    (see _generate_page_overrides()).
+    """
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    if page_overrides is None:
+        page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
     
-    lines = []
+    emit = _LineWriter(out)
     
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit(f"# {page_title} Page Overrides")
+    emit("")
+    emit(f"> **PROJECT:** {project}")
+    emit(f"> **Generated:** {timestamp}")
+    emit(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
+    emit("")
+    emit("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
+    emit("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
+    emit("")
+    emit("---")
+    emit("")
     
     # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
+    emit("## Page-Specific Rules")
+    emit("")
     
     # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
+    emit("### Layout Overrides")
+    emit("")
     layout = page_overrides.get("layout", {})
     if layout:
         for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
+            emit(f"- **{key}:** {value}")
     else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
+        emit("- No overrides — use Master layout")
+    emit("")
     
     # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
+    emit("### Spacing Overrides")
+    emit("")
     spacing = page_overrides.get("spacing", {})
     if spacing:
         for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
+            emit(f"- **{key}:** {value}")
     else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
+        emit("- No overrides — use Master spacing")
+    emit("")
     
     # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
+    emit("### Typography Overrides")
+    emit("")
     typography = page_overrides.get("typography", {})
     if typography:
         for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
+            emit(f"- **{key}:** {value}")
     else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
+        emit("- No overrides — use Master typography")
+    emit("")
     
     # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
+    emit("### Color Overrides")
+    emit("")
     colors = page_overrides.get("colors", {})
     if colors:
         for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
+            emit(f"- **{key}:** {value}")
     else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
+        emit("- No overrides — use Master colors")
+    emit("")
     
     # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
+    emit("### Component Overrides")
+    emit("")
     components = page_overrides.get("components", [])
     if components:
         for comp in components:
-            lines.append(f"- {comp}")
+            emit(f"- {comp}")
     else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
+        emit("- No overrides — use Master component specs")
+    emit("")
     
     # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
+    emit("---")
+    emit("")
+    emit("## Page-Specific Components")
+    emit("")
     unique_components = page_overrides.get("unique_components", [])
     if unique_components:
         for comp in unique_components:
-            lines.append(f"- {comp}")
+            emit(f"- {comp}")
     else:
-        lines.append("- No unique components for this page")
-    lines.append("")
+        emit("- No unique components for this page")
+    emit("")
     
     # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
+    emit("---")
+    emit("")
+    emit("## Recommendations")
+    emit("")
     recommendations = page_overrides.get("recommendations", [])
     if recommendations:
         for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+            emit(f"- {rec}")
+    emit("")
+
+
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            page_overrides: dict = None) -> str:
+    """Format a page-specific override file with intelligent AI-generated content."""
+    return _render(write_page_override_md, design_system, page_name, page_query=page_query,
+                   page_overrides=page_overrides)
 
 
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
@@ -918,22 +1349,40 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
+    return _generate_page_overrides([page_name], page_query, design_system)[page_name]
+
+
+def _generate_page_overrides(page_names: list, page_query: str, design_system: dict) -> dict:
+    """
+    Generate overrides for many pages with one shared search pass.
+
+    Every distinct page context is searched once per domain (style, ux, landing),
+    all lookups run sequentially against the cached indexes, and page-type
+    detection is reused for pages sharing a context.
+
+    Returns:
+        dict mapping page name -> overrides dict
+    """
     query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
-    
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
-    
-    # Extract results from search response
-    style_results = style_search.get("results", [])
-    ux_results = ux_search.get("results", [])
-    landing_results = landing_search.get("results", [])
-    
+    contexts = {name: f"{name.lower()} {query_lower}" for name in page_names}
+    jobs = [(context, domain, max_results)
+            for context in dict.fromkeys(contexts.values())
+            for domain, max_results in PAGE_SEARCH_CONFIG.items()]
+
+    found = {(context, domain): search(context, domain, max_results).get("results", [])
+             for context, domain, max_results in jobs}
+
+    overrides = {}
+    for context in dict.fromkeys(contexts.values()):
+        overrides[context] = _build_page_overrides(
+            context, found[(context, "style")], found[(context, "ux")], found[(context, "landing")]
+        )
+    return {name: copy.deepcopy(overrides[context]) for name, context in contexts.items()}
+
+
+def _build_page_overrides(combined_context: str, style_results: list, ux_results: list,
+                          landing_results: list) -> dict:
+    """Build one page's overrides from its style, UX and landing search results."""
     # Detect page type from search results or context
     page_type = _detect_page_type(combined_context, style_results)
     
@@ -1017,27 +1466,29 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     }
 
 
+# Page types in priority order (earlier wins ties); the page type's core term weighs double
+PAGE_TYPE_KEYWORDS = {
+    "Dashboard / Data View": [("dashboard", 2.0), "admin", "analytics", "data", "metrics", "stats", "monitor", "overview"],
+    "Checkout / Payment": [("checkout", 2.0), "payment", "cart", "purchase", "order", "billing"],
+    "Settings / Profile": [("settings", 2.0), "profile", "account", "preferences", "config"],
+    "Landing / Marketing": [("landing", 2.0), "marketing", "homepage", "hero", "home", "promo"],
+    "Authentication": [("login", 2.0), "signin", "signup", "register", "auth", "password"],
+    "Pricing / Plans": [("pricing", 2.0), "plans", "subscription", "tiers", "packages"],
+    "Blog / Article": [("blog", 2.0), "article", "post", "news", "content", "story"],
+    "Product Detail": [("product", 2.0), "item", "detail", "pdp", "shop", "store"],
+    "Search Results": [("search", 2.0), "results", "browse", "filter", "catalog", "list"],
+    "Empty State": [("empty", 2.0), "404", "error", "not found", "zero"],
+}
+
+# Compiled once at import; the query is split into words once and each word or phrase is a dict lookup
+PAGE_TYPE_MATCHER = KeywordMatcher(PAGE_TYPE_KEYWORDS)
+
+
 def _detect_page_type(context: str, style_results: list) -> str:
     """Detect page type from context and search results."""
-    context_lower = context.lower()
-    
-    # Check for common page type patterns
-    page_patterns = [
-        (["dashboard", "admin", "analytics", "data", "metrics", "stats", "monitor", "overview"], "Dashboard / Data View"),
-        (["checkout", "payment", "cart", "purchase", "order", "billing"], "Checkout / Payment"),
-        (["settings", "profile", "account", "preferences", "config"], "Settings / Profile"),
-        (["landing", "marketing", "homepage", "hero", "home", "promo"], "Landing / Marketing"),
-        (["login", "signin", "signup", "register", "auth", "password"], "Authentication"),
-        (["pricing", "plans", "subscription", "tiers", "packages"], "Pricing / Plans"),
-        (["blog", "article", "post", "news", "content", "story"], "Blog / Article"),
-        (["product", "item", "detail", "pdp", "shop", "store"], "Product Detail"),
-        (["search", "results", "browse", "filter", "catalog", "list"], "Search Results"),
-        (["empty", "404", "error", "not found", "zero"], "Empty State"),
-    ]
-    
-    for keywords, page_type in page_patterns:
-        if any(kw in context_lower for kw in keywords):
-            return page_type
+    page_type = PAGE_TYPE_MATCHER.best(context)
+    if page_type:
+        return page_type
     
     # Fallback: try to infer from style results
     if style_results:
@@ -1059,7 +1510,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate Design System")
     parser.add_argument("query", help="Search query (e.g., 'SaaS dashboard')")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format")
+    parser.add_argument("--format", "-f", choices=OUTPUT_FORMATS, default="ascii", help="Output format")
 
     args = parser.parse_args()
 
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Profiling - opt-in per-stage timings and cProfile dumps
+
+Off by default: stage() then returns a shared no-op context manager, so the
+instrumented code paths in core.py and design_system.py cost next to nothing.
+
+Enable with `search.py --profile` or UIPRO_PROFILE=1. When the process exits,
+per-stage timings are written to stderr as one JSON object (stdout stays
+clean for agents):
+
+    {"argv": [...], "total_ms": 41.2,
+     "stages": {"index.fit:styles.csv": {"calls": 1, "total_ms": 12.5, "mean_ms": 12.5, "max_ms": 12.5},
+                "search.score:stack:react": {...}, ...},
+     "trace": [{"stage": "index.tokenize", "label": "styles.csv", "at_ms": 3.1, "ms": 8.2}, ...],
+     "trace_dropped": 0, "cprofile": null}
+
+Stages carry a label naming the domain, stack or CSV they work on; a stage
+without one inherits the label of the stage it runs in (so BM25.fit's
+index.tokenize / index.postings are attributed to the CSV being fitted).
+"stages" aggregates by "<stage>:<label>", "trace" lists every call in the
+order it finished (up to TRACE_LIMIT calls).
+
+Add `--profile-dump FILE` or UIPRO_PROFILE_DUMP=FILE to also record a cProfile
+of the main thread (inspect with `python -m pstats FILE`).
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# ============ CONFIGURATION ============
+PROFILE_ENV = "UIPRO_PROFILE"
+PROFILE_DUMP_ENV = "UIPRO_PROFILE_DUMP"
+# Per-call trace entries kept in the report; later calls are only aggregated
+TRACE_LIMIT = 10000
+
+_NULL_STAGE = nullcontext()
+_ACTIVE = None
+
+
+class Profiler:
+    """Aggregates stage timings (thread-safe) and optionally runs cProfile."""
+
+    def __init__(self, dump=None):
+        self.dump = dump
+        self.stages = {}
+        self.trace = []
+        self.trace_dropped = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.perf_counter()
+        self.cprofile = None
+        if dump:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextmanager
+    def stage(self, name, label=None):
+        labels = getattr(self.local, "labels", None)
+        if labels is None:
+            labels = self.local.labels = []
+        if label is None and labels:
+            label = labels[-1]
+        labels.append(label)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            labels.pop()
+            self.record(name, (time.perf_counter() - started) * 1000, label, started)
+
+    def record(self, name, ms, label=None, started=None):
+        key = f"{name}:{label}" if label else name
+        at_ms = ((started or time.perf_counter()) - self.started) * 1000
+        with self.lock:
+            entry = self.stages.get(key)
+            if entry is None:
+                entry = self.stages[key] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+            entry["calls"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            if len(self.trace) < TRACE_LIMIT:
+                self.trace.append({"stage": name, "label": label, "at_ms": round(at_ms, 3), "ms": round(ms, 3)})
+            else:
+                self.trace_dropped += 1
+
+    def report(self):
+        """Stage timings as a JSON-serializable dict, slowest stage first"""
+        with self.lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            trace = list(self.trace)
+        return {
+            "argv": sys.argv[1:],
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "stages": {name: {"calls": entry["calls"],
+                              "total_ms": round(entry["total_ms"], 3),
+                              "mean_ms": round(entry["total_ms"] / entry["calls"], 3),
+                              "max_ms": round(entry["max_ms"], 3)}
+                       for name, entry in stages},
+            "trace": trace,
+            "trace_dropped": self.trace_dropped,
+            "cprofile": self.dump
+        }
+
+    def finish(self):
+        """Stop cProfile (writing the dump) and return report()"""
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.dump)
+            self.cprofile = None
+        return self.report()
+
+
+def stage(name, label=None):
+    """Context manager timing one stage (of the domain/stack/CSV label); a no-op unless profiling is enabled"""
+    return _ACTIVE.stage(name, label) if _ACTIVE is not None else _NULL_STAGE
+
+
+def enable(dump=None, out=None):
+    """Start profiling this process; the report is written to out (stderr) at exit"""
+    global _ACTIVE
+    if _ACTIVE is None:
+        _ACTIVE = Profiler(dump)
+        atexit.register(_write_report, out)
+    return _ACTIVE
+
+
+def _write_report(out):
+    if _ACTIVE is None:
+        return
+    out = out or sys.stderr
+    out.write(json.dumps(_ACTIVE.finish(), ensure_ascii=False) + "\n")
+    out.flush()
+
+
+if os.environ.get(PROFILE_ENV) or os.environ.get(PROFILE_DUMP_ENV):
+    enable(os.environ.get(PROFILE_DUMP_ENV) or None)
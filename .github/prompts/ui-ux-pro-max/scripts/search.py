@@ -4,27 +4,109 @@
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
+       python search.py "<query>" --design-system [-f ascii|markdown|json|compact]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages home,dashboard,checkout
+       python search.py --batch [queries.jsonl] [--max-results 3]
+       python search.py --design-system --manifest projects.json [--persist]
+       python search.py --serve [--server 127.0.0.1:8765 | --server unix:/tmp/uipro.sock]
+       python search.py --build-bundle [FILE]
+       python search.py --seed-synonyms
 
-Domains: style, prompt, color, chart, landing, product, ux, typography
-Stacks: html-tailwind, react, nextjs
+Domains: style, prompt, color, chart, landing, product, ux, typography, all
+Stacks: html-tailwind, react, nextjs, ... - several comma-separated, or all:
+  --stack react,nextjs,astro   One ranking merged across the stacks (rows tagged "Stack")
+  --group                      With several stacks, list the top results per stack instead
+
+Design system formats:
+  ascii, markdown   Rendered documents for reading
+  json, compact     Raw generate() dict with per-domain scores and timings under "_meta"
+                    (compact is single-line JSON, one project per line with --manifest)
 
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages; all override files are generated in one search pass
+  --dry-run    With --persist, show which files would change (unified diff) without writing
+  --manifest   Generate many projects in one run from a JSON/JSONL manifest of
+               {"query": "...", "project_name": "...", "pages": ["home", "dashboard"]}
+
+Batch mode (one process, indexes fitted once):
+  --batch      Read queries from a file (or stdin) and stream JSON Lines results.
+               Each line is plain query text or a JSON object:
+               {"query": "...", "domain": "ux", "stack": "react", "max_results": 5, "id": 1}
+
+Daemon mode (indexes fitted once per session):
+  --serve      Run a search daemon on localhost HTTP or a Unix socket
+  --server     Send queries to the daemon at this address (or set UIPRO_SERVER);
+               falls back to in-process search when no daemon is running
+
+Compiled data bundle:
+  --build-bundle  Compile the CSVs and their search indexes into one memory-mapped
+                  binary file (default: .cache/data.bundle, or $UIPRO_BUNDLE).
+                  CSVs stay the source of truth; edited CSVs are read directly
+                  until the bundle is rebuilt. Rebuilds only refit edited CSVs.
+
+Custom domains:
+  Extra CSV domains and stacks are discovered from ui-ux-pro-max/domains/ (or the
+  manifest files/directories in $UIPRO_DOMAINS); see core.load_user_domains().
+
+Synonyms:
+  data/synonyms.csv groups aliases ("ecommerce" = "shop", "webshop", ...); they are
+  baked into the index, so queries need no expansion.
+  --seed-synonyms  Print candidate groups mined from the CSVs' Keywords columns
+                   (for review before adding them to data/synonyms.csv)
+
+Profiling (opt-in, also via UIPRO_PROFILE=1 / UIPRO_PROFILE_DUMP=FILE):
+  --profile       Write per-stage timings as JSON to stderr when the command exits,
+                  keyed by stage and domain/stack/CSV (e.g. "index.fit:styles.csv"),
+                  plus a per-call trace
+  --profile-dump  Also save a cProfile dump of the main thread (python -m pstats FILE)
 """
 
 import argparse
 import sys
-import io
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import os
+from core import (CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, BatchParseError, compile_bundle, mine_synonyms, search,
+                  search_stack, search_batch)
+
+# Startup matters: agents run this script many times per session. design_system
+# (and its thread pool, difflib, datetime imports) is only imported by the modes
+# that need it; benchmarks/startup.py checks the import-time budget.
+# Mirrors design_system.OUTPUT_FORMATS so argument parsing doesn't import it
+DESIGN_SYSTEM_FORMATS = ("ascii", "markdown", "json", "compact")
+
+
+def force_utf8():
+    """Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)"""
+    for stream in (sys.stdout, sys.stderr):
+        if stream.encoding and stream.encoding.lower() != 'utf-8':
+            stream.reconfigure(encoding='utf-8')
 
-# Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)
-if sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-if sys.stderr.encoding and sys.stderr.encoding.lower() != 'utf-8':
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+def stack_list(value):
+    """argparse type for --stack: comma-separated known stacks, or 'all'"""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name != "all" and name not in AVAILABLE_STACKS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"invalid stack: {', '.join(unknown) or repr(value)} "
+                                         f"(choose from {', '.join(AVAILABLE_STACKS)}, all)")
+    return ",".join(names)
+
+
+def format_rows(rows, heading="###"):
+    """Result rows as markdown bullet lists, long values truncated"""
+    output = []
+    for i, row in enumerate(rows, 1):
+        output.append(f"{heading} Result {i}")
+        for key, value in row.items():
+            value_str = str(value)
+            if len(value_str) > 300:
+                value_str = value_str[:300] + "..."
+            output.append(f"- **{key}:** {value_str}")
+        output.append("")
+    return output
 
 
 def format_output(result):
@@ -41,74 +123,198 @@ def format_output(result):
         output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
     output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
 
-    for i, row in enumerate(result['results'], 1):
-        output.append(f"### Result {i}")
-        for key, value in row.items():
-            value_str = str(value)
-            if len(value_str) > 300:
-                value_str = value_str[:300] + "..."
-            output.append(f"- **{key}:** {value_str}")
-        output.append("")
+    # Multi-stack search grouped per stack
+    for stack, group in result.get("groups", {}).items():
+        output.append(f"### {stack} ({group.get('count', 0)} results)\n")
+        output += format_rows(group.get("results", []), "####")
 
+    output += format_rows(result.get("results", []))
     return "\n".join(output)
 
 
+def read_batch(stream):
+    """Parse batch input lines into query dicts (plain text or JSON objects)"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield BatchParseError(error=f"Invalid JSON on line {line_no}: {e.msg}", line=line_no)
+                continue
+            yield item
+        else:
+            yield {"query": line}
+
+
+def run_batch(source, max_results):
+    """Stream JSON Lines results for every query in source ("-" for stdin)"""
+    stream = sys.stdin if source == "-" else open(source, 'r', encoding='utf-8')
+    try:
+        for result in search_batch(read_batch(stream), max_results):
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def via_server(address, endpoint, payload, fallback):
+    """Ask the search daemon when one is configured, else run fallback() in-process"""
+    if address or os.environ.get("UIPRO_SERVER"):
+        from server import request
+        result = request(endpoint, payload, address)
+        if result is not None:
+            return result
+    return fallback()
+
+
 if __name__ == "__main__":
+    force_utf8()
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()) + ["all"], help="Search domain ('all' ranks every domain and stack together)")
+    parser.add_argument("--stack", "-s", type=stack_list, help="Stack-specific search: one stack, several comma-separated, or 'all'")
+    parser.add_argument("--group", action="store_true", help="With several stacks, group results per stack instead of merging")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
+    parser.add_argument("--format", "-f", choices=DESIGN_SYSTEM_FORMATS, default="ascii", help="Output format for design system (json/compact skip text rendering)")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated pages to create override files for (e.g. home,dashboard,checkout)")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--dry-run", action="store_true", help="With --persist, report pending changes as a diff without writing files")
+    parser.add_argument("--manifest", type=str, default=None, metavar="FILE", help="Generate design systems for every entry in a JSON/JSONL manifest")
+    # Batch mode
+    parser.add_argument("--batch", nargs="?", const="-", default=None, metavar="FILE", help="Read queries from FILE (or stdin) and stream JSON Lines results")
+
+    # Daemon mode
+    parser.add_argument("--serve", action="store_true", help="Run a long-lived search daemon with all indexes preloaded")
+    parser.add_argument("--server", type=str, default=None, metavar="ADDR", help="Daemon address: host:port or unix:/path (default: $UIPRO_SERVER)")
+    parser.add_argument("--seed-synonyms", action="store_true", help="Print synonym groups mined from Keywords columns as data/synonyms.csv rows")
+    # Profiling
+    parser.add_argument("--profile", action="store_true", help="Write per-stage timings as JSON to stderr on exit")
+    parser.add_argument("--profile-dump", type=str, default=None, metavar="FILE", help="Also write cProfile stats to FILE (implies --profile)")
+    # Compiled data bundle
+    parser.add_argument("--build-bundle", nargs="?", const="", default=None, metavar="FILE", help="Compile CSVs and indexes into a binary bundle (default: .cache/data.bundle)")
 
     args = parser.parse_args()
+    if args.profile or args.profile_dump:
+        import profiling
+        profiling.enable(args.profile_dump)
+    pages = [p.strip() for p in args.pages.split(",") if p.strip()] if args.pages else []
+    if args.design_system and args.persist and not args.manifest:
+        from design_system import page_names_error
+        error = page_names_error(args.page, pages)
+        if error:
+            parser.error(error)
+
+    if (args.batch is None and args.build_bundle is None and not args.seed_synonyms and not args.serve
+            and not args.manifest and not args.query):
+        parser.error("the following arguments are required: query")
 
+    if args.seed_synonyms:
+        for terms in mine_synonyms():
+            print(f'{terms[0]},"{", ".join(terms[1:])}"')
+    elif args.build_bundle is not None:
+        summary = compile_bundle(args.build_bundle or None)
+        print(f"Compiled {summary['tables']} tables and {summary['indexes']} indexes "
+              f"({summary['refit']} refit, {summary['strings']} unique strings, "
+              f"{summary['bytes'] // 1024} KB) to {summary['path']}")
+    elif args.serve:
+        from server import serve
+        serve(args.server)
+    # Batch mode reuses fitted indexes across all queries
+    elif args.batch is not None:
+        run_batch(args.batch, args.max_results)
+    # Many design systems from one manifest
+    elif args.manifest:
+        from design_system import format_persist_report, iter_design_systems, load_manifest, write_design_system
+        results = iter_design_systems(load_manifest(args.manifest), persist=args.persist,
+                                      output_dir=args.output_dir, dry_run=args.dry_run)
+        for result in results:
+            # Structured formats emit one JSON document per project
+            if args.format in ("json", "compact"):
+                write_design_system(result, args.format, sys.stdout)
+                print("")
+                continue
+            if "error" in result:
+                print(f"Error: {result['error']} ({result.get('project_name') or 'unnamed entry'})\n")
+                continue
+            if not args.dry_run:
+                write_design_system(result["design_system"], args.format, sys.stdout)
+                print("")
+            if result["persisted"]:
+                print(format_persist_report(result["persisted"]))
+            print("")
+    # Preview what --persist would change
+    elif args.design_system and args.persist and args.dry_run:
+        from design_system import DesignSystemGenerator, format_persist_report, persist_design_system
+        design_system = DesignSystemGenerator().generate(args.query, args.project_name)
+        report = persist_design_system(design_system, args.page, args.output_dir, args.query,
+                                       pages=pages, dry_run=True)
+        print(format_persist_report(report))
     # Design system takes priority
-    if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+    elif args.design_system:
+        output_dir = os.path.abspath(args.output_dir) if args.output_dir else os.getcwd()
+
+        # In-process fallback; daemon-backed runs never import design_system
+        def generate():
+            from design_system import generate_design_system
+            return {"output": generate_design_system(
+                args.query,
+                args.project_name,
+                args.format,
+                persist=args.persist,
+                page=args.page,
+                output_dir=output_dir,
+                pages=pages
+            )}
+
+        # The daemon never writes files for a client, so persisting stays in-process
+        result = generate() if args.persist else via_server(args.server, "/design_system", {
+            "query": args.query,
+            "project_name": args.project_name,
+            "format": args.format
+        }, generate)
+        print(result.get("output", f"Error: {result.get('error')}"))
         
-        # Print persistence confirmation
+        # Print persistence confirmation; on stderr for json/compact so stdout stays one document
         if args.persist:
+            banner = sys.stderr if args.format in ("json", "compact") else sys.stdout
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
+            print("\n" + "=" * 60, file=banner)
+            print(f"✅ Design system persisted to design-system/{project_slug}/", file=banner)
+            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)", file=banner)
+            for page_filename in dict.fromkeys(name.lower().replace(' ', '-')
+                                               for name in ([args.page] if args.page else []) + pages):
+                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)", file=banner)
+            print("", file=banner)
+            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.", file=banner)
+            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.", file=banner)
+            print("=" * 60, file=banner)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = via_server(args.server, "/search_stack",
+                            {"query": args.query, "stack": args.stack, "max_results": args.max_results,
+                             "group": args.group},
+                            lambda: search_stack(args.query, args.stack, args.max_results, args.group))
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = via_server(args.server, "/search",
+                            {"query": args.query, "domain": args.domain, "max_results": args.max_results},
+                            lambda: search(args.query, args.domain, args.max_results))
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
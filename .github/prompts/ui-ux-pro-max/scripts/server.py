@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Server - Long-running search daemon with a thin client
+
+The daemon loads and fits every CSV_CONFIG and STACK_CONFIG index once, then
+answers JSON requests over localhost HTTP or a Unix socket:
+
+    POST /search          {"query": "...", "domain": "ux", "max_results": 3}
+    POST /search_stack    {"query": "...", "stack": "react,nextjs", "max_results": 3, "group": false}
+    POST /design_system   {"query": "...", "project_name": "...", "format": "ascii"}
+    GET  /health
+
+POSTs must carry Content-Type: application/json and a loopback Host, and no
+Origin header. Persisted files land in the daemon's working directory.
+
+Usage:
+    python search.py --serve                         # http://127.0.0.1:8765
+    python search.py --serve --server unix:/tmp/uipro.sock
+    UIPRO_SERVER=127.0.0.1:8765 python search.py "glassmorphism"
+
+The client side (request()) returns None when no daemon is reachable so callers
+can fall back to in-process search.
+"""
+
+import http.client
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import stat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from core import MAX_RESULTS, query_error, search, search_stack, warm_indexes
+
+# ============ CONFIGURATION ============
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+SERVER_ENV = "UIPRO_SERVER"
+CLIENT_TIMEOUT = 30
+ENDPOINTS = ("/search", "/search_stack", "/design_system")
+# Host header values accepted by the daemon (port stripped)
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def parse_address(address=None):
+    """Parse "host:port", "http://host:port" or "unix:/path" into (kind, target)"""
+    address = address or os.environ.get(SERVER_ENV) or DEFAULT_ADDRESS
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    if address.startswith("http://"):
+        address = address[len("http://"):].rstrip("/")
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+# ============ REQUEST HANDLING ============
+def handle_request(endpoint, payload):
+    """Dispatch a decoded request to the search functions"""
+    error = query_error(payload)
+    if error:
+        return {"error": error}
+    query = payload["query"]
+    max_results = payload.get("max_results") or MAX_RESULTS
+
+    if endpoint == "/search":
+        return search(query, payload.get("domain"), max_results)
+    if endpoint == "/search_stack":
+        return search_stack(query, payload.get("stack"), max_results, payload.get("group", False))
+    if endpoint == "/design_system":
+        # Persisted files go under the daemon's working directory, never a caller-chosen path
+        if payload.get("output_dir") is not None:
+            return {"error": "output_dir is not accepted by the daemon; persist in-process instead"}
+        from design_system import generate_design_system, page_names_error
+        project_name = payload.get("project_name")
+        if project_name is not None and not isinstance(project_name, str):
+            return {"error": "project_name must be a string"}
+        error = page_names_error(payload.get("page"), payload.get("pages"))
+        if error:
+            return {"error": error}
+        output = generate_design_system(
+            query,
+            payload.get("project_name"),
+            payload.get("format", "ascii"),
+            persist=payload.get("persist", False),
+            page=payload.get("page"),
+            pages=payload.get("pages")
+        )
+        return {"output": output}
+    return {"error": f"Unknown endpoint: {endpoint}"}
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP handler shared by the TCP and Unix socket servers."""
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def _is_local(self):
+        """Unix socket or loopback TCP peer"""
+        host = self.client_address[0]
+        if host == "unix":
+            return True
+        try:
+            return ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            return False
+
+    def _request_error(self):
+        """(status, message) when a POST must be refused, else None
+
+        Browsers can send simple cross-origin POSTs to loopback; a JSON
+        Content-Type, a loopback Host and no Origin header rule those out.
+        """
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        if self.headers.get("Origin") is not None:
+            return 403, "Cross-origin requests are not accepted"
+        try:
+            host = urlsplit("//" + self.headers.get("Host", "")).hostname
+        except ValueError:
+            host = None
+        if host not in LOOPBACK_HOSTS:
+            return 403, "Host must be a loopback address"
+        return None
+
+    def do_POST(self):
+        if self.path not in ENDPOINTS:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        refused = self._request_error()
+        if refused:
+            self._send_json(refused[0], {"error": refused[1]})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e.msg}"})
+            return
+        # Persisting writes files wherever the caller asks; only local clients may do that
+        if isinstance(payload, dict) and payload.get("persist") and not self._is_local():
+            self._send_json(403, {"error": "persist is only available to local clients"})
+            return
+        try:
+            result = handle_request(self.path, payload)
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        """Keep the daemon quiet; agents read stdout."""
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server bound to a Unix domain socket."""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port)-style client address
+        return request, ("unix", 0)
+
+
+def _is_socket(path):
+    """Whether path exists and is a Unix domain socket"""
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def serve(address=None):
+    """Fit all indexes once and serve requests until interrupted"""
+    kind, target = parse_address(address)
+    fitted = warm_indexes()
+
+    if kind == "unix":
+        if os.path.exists(target):
+            if not _is_socket(target):
+                raise SystemExit(f"Refusing to replace {target}: it exists and is not a socket")
+            os.unlink(target)
+        server = UnixHTTPServer(target, SearchRequestHandler)
+        location = f"unix:{target}"
+    else:
+        server = ThreadingHTTPServer(target, SearchRequestHandler)
+        location = f"http://{target[0]}:{server.server_address[1]}"
+
+    print(f"UI Pro Max search daemon: {fitted} indexes ready on {location}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if kind == "unix" and _is_socket(target):
+            os.unlink(target)
+
+
+# ============ CLIENT ============
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to a Unix domain socket."""
+
+    def __init__(self, path, timeout=CLIENT_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def request(endpoint, payload, address=None):
+    """
+    Send a request to the daemon.
+
+    Returns the decoded JSON response (an {"error": ...} dict when the daemon
+    fails the request), or None only if no daemon is reachable, so the caller
+    falls back to in-process search without rerunning failed requests.
+    """
+    kind, target = parse_address(address)
+    if kind == "unix":
+        conn = UnixHTTPConnection(target)
+    else:
+        conn = http.client.HTTPConnection(target[0], target[1], timeout=CLIENT_TIMEOUT)
+
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    try:
+        try:
+            conn.connect()
+        except OSError:
+            return None
+        conn.request("POST", endpoint, body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return json.loads(response.read())
+    except (OSError, http.client.HTTPException, json.JSONDecodeError) as e:
+        return {"error": f"Search daemon failed the request: {e}"}
+    finally:
+        conn.close()